@@ -0,0 +1,61 @@
+"""Per-agent memory and spawn rate for large populations.
+
+Run from the repository root:
+
+    python -m benchmarks.agent_memory --agents 1000000
+
+The map is generated as WorldLayers directly so that world generation does
+not dominate the measurement.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+import numpy as np
+from src.model import SoulslikeModel
+from src.agents import AgentType
+from src.environment import TERRAIN_WEIGHTS, OBSTACLE_DENSITY
+from src.world_layers import WorldLayers, NO_OBSTACLE
+
+def build_layers(agents, seed):
+    """Generates a square map with comfortably more walkable cells than agents."""
+    rng = np.random.default_rng(seed)
+    size = int(np.ceil(np.sqrt(agents / (1 - OBSTACLE_DENSITY) * 1.2)))
+    layers = WorldLayers(np.zeros((3, size, size), dtype=np.int8))
+    layers.terrain[:] = rng.choice(len(TERRAIN_WEIGHTS), size=(size, size), p=TERRAIN_WEIGHTS)
+    layers.walkable[:] = rng.random((size, size)) >= OBSTACLE_DENSITY
+    layers.obstacles[:] = np.where(layers.walkable, NO_OBSTACLE, 2)
+    return layers
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    layers = build_layers(args.agents, args.seed)
+
+    model = SoulslikeModel(0, 0, 0, 0, 0, layers=layers)
+    model.get_free_cells()
+    start = time.perf_counter()
+    model.spawn_agents(AgentType.ENEMY, args.agents)
+    elapsed = time.perf_counter() - start
+    del model
+    gc.collect()
+
+    # Measured separately because tracing allocations slows spawning down
+    model = SoulslikeModel(0, 0, 0, 0, 0, layers=layers)
+    model.get_free_cells()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    model.spawn_agents(AgentType.ENEMY, args.agents)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"agents:          {args.agents}")
+    print(f"spawn rate:      {args.agents / elapsed:,.0f} agents/s ({elapsed:.2f} s)")
+    print(f"memory / agent:  {(after - before) / args.agents:,.0f} bytes (including grid and schedule entries)")
+
+if __name__ == "__main__":
+    main()
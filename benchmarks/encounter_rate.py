@@ -0,0 +1,46 @@
+"""Monte Carlo encounter throughput and balance report.
+
+Run from the repository root:
+
+    python -m benchmarks.encounter_rate --trials 1000000 --level 5 --enemies 3
+
+Simulates a player with an Iron Sword against a group of level-1 enemies and
+prints outcome rates, time to kill and stamina exhaustion with their
+confidence intervals. Enemies act on the DecisionEngine's weights and the
+player on the rules of Player.step, so of its skills the player only ever
+casts Healing Light. Enemies flee below FLEE_HEALTH, so most fights the player
+survives end as routs rather than kills; time to kill covers kills only.
+
+On one core this setup runs about 13-14k encounters/s, so the default million
+trials take about 75 s. --workers spreads the batches over a process pool,
+which only helps with as many free cores.
+"""
+import argparse
+import time
+from src.encounter import Combatant, simulate_encounter
+from src.item_system import EquipmentSlot, basic_equipment, sword
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=1000000)
+    parser.add_argument("--level", type=int, default=5)
+    parser.add_argument("--enemies", type=int, default=3)
+    parser.add_argument("--enemy-level", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    equipment = basic_equipment()
+    equipment.equip(sword, EquipmentSlot.MAIN_HAND)
+    player = Combatant(args.level, equipment, ("fireball", "healing_light", "quick_step"))
+    enemies = [Combatant(args.enemy_level, skills=("fireball",)) for _ in range(args.enemies)]
+
+    start = time.perf_counter()
+    result = simulate_encounter([player], enemies, args.trials, seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(result.summary())
+    print(f"throughput:        {args.trials / elapsed:,.0f} encounters/s ({elapsed:.2f} s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Cold-start import time of the simulator's entry points.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time --budget-ms 150
+
+Every module is imported in a fresh interpreter, several times, and the
+fastest run is reported. Headless worker modules (partition workers, the
+encounter simulator, replay analysis) must stay within the budget and none of
+the core modules may import pygame. Exits with status 1 if a check fails.
+"""
+import argparse
+import subprocess
+import sys
+
+# Modules a headless worker process imports before doing any simulation work
+WORKER_MODULES = ("src.partition", "src.encounter", "src.replay")
+CORE_MODULES = ("src.model", "main")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, "pygame" in sys.modules, "mesa" in sys.modules)
+"""
+
+def measure(module, repeat):
+    """Returns (best seconds, imports pygame, imports mesa) for importing a module in fresh interpreters."""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(module=module)], check=True,
+                                capture_output=True, text=True).stdout.split()
+        runs.append((float(output[0]), output[1] == "True", output[2] == "True"))
+    return min(runs)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=150)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<18}{'import':>10}  pygame  mesa")
+    for module in WORKER_MODULES + CORE_MODULES:
+        seconds, pygame, mesa = measure(module, args.repeat)
+        print(f"{module:<18}{seconds * 1000:>8.0f} ms  {'yes' if pygame else 'no':<6}  {'yes' if mesa else 'no'}")
+        if pygame:
+            failures.append(f"{module} imports pygame")
+        if module in WORKER_MODULES and seconds * 1000 > args.budget_ms:
+            failures.append(f"{module} took {seconds * 1000:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print("FAIL:", failure)
+    if failures:
+        sys.exit(1)
+    print(f"OK: worker modules within {args.budget_ms:.0f} ms and no core module imports pygame")
+
+if __name__ == "__main__":
+    main()
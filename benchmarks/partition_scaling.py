@@ -0,0 +1,72 @@
+"""Throughput of PartitionedSimulation on a large map as workers are added.
+
+Run from the repository root:
+
+    python -m benchmarks.partition_scaling --size 1000 --agents 20000 --ticks 50
+
+Every multi-process run is checked against the serial run, which must end in
+exactly the same state.
+
+Workers only pay off with a free core each. Every tick costs two barrier
+waits per worker plus process start-up, so with fewer cores than workers the
+processes just take turns: on one core, 1/2/4 workers ran at 39k/22k/12.6k
+agent-ticks/s against 76k serially (2-6x slower). Rows with more workers
+than cores are marked.
+"""
+import argparse
+import os
+import time
+import numpy as np
+from src.model import SoulslikeModel
+from src.agents import AgentType
+from src.environment import ObstacleType, TERRAIN_WEIGHTS, OBSTACLE_DENSITY
+from src.partition import PartitionedSimulation, agent_table
+from src.world_layers import WorldLayers, NO_OBSTACLE
+
+def build_state(size, agents, seed):
+    """Generates a random map and population using real agents as templates."""
+    rng = np.random.default_rng(seed)
+    template_model = SoulslikeModel(5, 5, 1, 1, 1)
+    templates = {row["kind"]: row for row in agent_table(template_model)}
+    layers = WorldLayers(np.zeros((3, size, size), dtype=np.int8))
+    layers.terrain[:] = rng.choice(len(TERRAIN_WEIGHTS), size=(size, size), p=TERRAIN_WEIGHTS)
+    layers.walkable[:] = rng.random((size, size)) >= OBSTACLE_DENSITY
+    layers.obstacles[:] = np.where(layers.walkable, NO_OBSTACLE, ObstacleType.ROCK.value)
+    kinds = rng.choice([AgentType.PLAYER.value, AgentType.ENEMY.value, AgentType.NEUTRAL.value],
+                       size=agents, p=[0.2, 0.6, 0.2])
+    state = np.stack([templates[kind] for kind in kinds])
+    cells = rng.choice(np.flatnonzero(layers.walkable), size=agents, replace=False)
+    state["id"] = np.arange(agents)
+    state["x"], state["y"] = np.divmod(cells, size)
+    return state, layers
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--agents", type=int, default=20000)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--regions", type=int, default=4, help="Regions per side")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    state, layers = build_state(args.size, args.agents, args.seed)
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"cores={cores}")
+    regions = (args.regions, args.regions)
+    reference = None
+    for workers in [0, 1, 2, 4, 8, 16]:
+        if workers > args.regions ** 2:
+            break
+        sim = PartitionedSimulation(state, layers, regions, args.seed)
+        start = time.perf_counter()
+        migrations = sim.run(args.ticks, workers=workers)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = sim.state
+        matches = np.array_equal(sim.state, reference)
+        print(f"workers={workers:2d} {args.agents * args.ticks / elapsed:12.0f} agent-ticks/s "
+              f"migrations={migrations} matches_serial={matches}"
+              + (" (more workers than cores)" if workers > cores else ""))
+
+if __name__ == "__main__":
+    main()
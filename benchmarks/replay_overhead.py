@@ -0,0 +1,74 @@
+"""Replay recording overhead, file size and seek time.
+
+Run from the repository root:
+
+    python -m benchmarks.replay_overhead --size 100 --agents 2000 --ticks 300
+
+Runs the same model setup with and without a ReplayRecorder attached, then
+reports the extra time per tick, the size of the saved recording and how long
+Replay.state_at() takes to seek to random ticks.
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+import numpy as np
+from src.model import SoulslikeModel
+from src.replay import ReplayRecorder, Replay
+
+def build_model(size, agents, seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    model = SoulslikeModel(size, size, agents // 10, agents * 8 // 10, agents // 10)
+    model.random.seed(seed)
+    return model
+
+def run(model, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        model.step()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--agents", type=int, default=2000)
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--keyframe-interval", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):  # Agents print every skill they learn and use
+        plain = run(build_model(args.size, args.agents, args.seed), args.ticks)
+        model = build_model(args.size, args.agents, args.seed)
+        recorder = ReplayRecorder(model, args.keyframe_interval)
+        recorded = run(model, args.ticks)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "replay.npz")
+        start = time.perf_counter()
+        recorder.save(path)
+        saved = time.perf_counter() - start
+        size = os.path.getsize(path)
+        replay = Replay.load(path)
+
+    ticks = np.random.default_rng(args.seed).integers(replay.first_tick, replay.last_tick + 1, 50)
+    start = time.perf_counter()
+    for tick in ticks.tolist():
+        replay.state_at(tick)
+    seek = (time.perf_counter() - start) / len(ticks)
+
+    print(f"ticks:            {args.ticks} with {args.agents} agents on {args.size}x{args.size}")
+    print(f"without recorder: {plain / args.ticks * 1000:.2f} ms/tick")
+    print(f"with recorder:    {recorded / args.ticks * 1000:.2f} ms/tick "
+          f"({(recorded - plain) / plain * 100:+.1f}%)")
+    print(f"file size:        {size:,} bytes ({size / args.ticks:,.0f} bytes/tick, "
+          f"{len(replay.events):,} events), saved in {saved:.2f} s")
+    print(f"seek:             {seek * 1000:.2f} ms per state_at() with keyframes every "
+          f"{args.keyframe_interval} ticks")
+
+if __name__ == "__main__":
+    main()
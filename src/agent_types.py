@@ -0,0 +1,36 @@
+from enum import Enum
+
+class AgentType(Enum):
+    PLAYER = 0
+    ENEMY = 1
+    NEUTRAL = 2
+
+class StatusEffect(Enum):
+    POISON = 0
+    WET = 1
+    BURNING = 2
+    STAGGERED = 3
+    INVULNERABLE = 4
+    PARRYING = 5
+
+# Ticks a status effect lasts after being applied; reapplying refreshes it
+STATUS_EFFECT_DURATIONS = {
+    StatusEffect.POISON: 5,
+    StatusEffect.WET: 3,
+    StatusEffect.BURNING: 3,
+    StatusEffect.STAGGERED: 1,
+    StatusEffect.INVULNERABLE: 1,
+    StatusEffect.PARRYING: 1,
+}
+
+# Damage dealt on every tick the effect is active
+STATUS_EFFECT_DAMAGE = {
+    StatusEffect.POISON: 5,
+    StatusEffect.BURNING: 10,
+}
+
+def as_status_effect(effect):
+    """Converts a status effect name such as "poison" to a StatusEffect."""
+    if isinstance(effect, str):
+        return StatusEffect[effect.upper()]
+    return effect
@@ -1,32 +1,47 @@
-from mesa import Agent
-from enum import Enum
+import contextlib
+from src.agent_types import (AgentType, StatusEffect, STATUS_EFFECT_DURATIONS, STATUS_EFFECT_DAMAGE,
+                             as_status_effect)
 from src.combat_system import CombatSystem, AttackType
-from src.ai_behavior import AIController
-from src.item_system import Inventory, Equipment, create_basic_equipment
-from src.skills import get_skill
+from src.ai_behavior import AIController, AIState
+from src.item_system import Inventory, basic_equipment
+from src.skills import get_skill, get_skill_catalog
+from src.progression_system import ProgressionManager, derived_stats
 import random
 
-class AgentType(Enum):
-    PLAYER = 0
-    ENEMY = 1
-    NEUTRAL = 2
-
-class StatusEffect(Enum):
-    POISON = 0
-    WET = 1
-    BURNING = 2
-    STAGGERED = 3
-    INVULNERABLE = 4
-    PARRYING = 5
-
-class SoulslikeAgent(Agent):
-    """Base class for all agents (players and NPCs)."""
+_default_skill_sets = {}  # Agent class -> tuple of starting skills
+
+class SoulslikeAgent:
+    """Base class for all agents (players and NPCs).
+
+    Attributes live in __slots__, starting gear and skills are shared with
+    other agents until they change, and the inventory, status-effect
+    bookkeeping and cooldown array are only allocated when first needed.
+    Agents provide what Mesa expects of mesa.Agent (unique_id, model, pos,
+    random, step, advance, remove and registration with the model) without
+    subclassing it: its instances carry a __dict__, which would accept any
+    attribute and cost memory on every agent.
+    """
+    __slots__ = ("unique_id", "model", "pos", "__weakref__", "agent_type", "_health", "_health_tick",
+                 "max_health", "health_regen", "_stamina", "_stamina_tick", "max_stamina", "poise", "max_poise", "strength", "dexterity", "vitality",
+                 "endurance", "level", "experience", "_inventory", "equipment", "status_effects",
+                 "_status_expiry", "detection_range", "skills", "skill_cooldowns", "ai_state", "ai_action",
+                 "ai_target")
+
+    default_skill_names = ()  # Skills every agent of the class starts with
+
     def __init__(self, unique_id, model, agent_type):
-        super().__init__(unique_id, model)
+        self.unique_id = unique_id
+        self.model = model
+        self.pos = None
+        model.register_agent(self)
+        now = model.timers.now
         self.agent_type = agent_type
-        self.health = 100.0
+        self._health = 100.0
+        self._health_tick = now
         self.max_health = 100.0
-        self.stamina = 100.0
+        self.health_regen = 0.0  # Health regenerated per tick
+        self._stamina = 100.0
+        self._stamina_tick = now
         self.max_stamina = 100.0
         self.poise = 50.0
         self.max_poise = 50.0
@@ -36,42 +51,91 @@ class SoulslikeAgent(Agent):
         self.endurance = 10
         self.level = 1
         self.experience = 0
-        self.inventory = Inventory(capacity=20)
-        self.equipment = Equipment()
+        self._inventory = None
         self.equip_basic_gear()
-        self.status_effects = []
+        self.status_effects = ()  # Replaced by a list on the first status effect
+        self._status_expiry = None
         self.detection_range = 5
-        self.skills = []
-        self.skill_cooldowns = {}
+        self.skills = type(self).default_skills()
+        self.skill_cooldowns = None  # Indexed by skill_id: 0 when ready, otherwise the tick the cooldown ends on
+        self.ai_state = AIState.IDLE
+        self.ai_action = None  # (AIAction, skill_id) picked by the DecisionEngine for this tick
+        self.ai_target = None
+
+    @classmethod
+    def default_skills(cls):
+        """Returns the shared tuple of skills agents of this class start with."""
+        skills = _default_skill_sets.get(cls)
+        if skills is None:
+            skills = _default_skill_sets[cls] = tuple(get_skill(name) for name in cls.default_skill_names)
+        return skills
+
+    @property
+    def inventory(self):
+        """The agent's inventory, created on first access."""
+        if self._inventory is None:
+            self._inventory = Inventory(capacity=20)
+        return self._inventory
+
+    @property
+    def health(self):
+        """Current health, including regeneration accrued since it was last set."""
+        if self.health_regen:
+            elapsed = self.model.timers.now - self._health_tick
+            if elapsed > 0 and self._health > 0:
+                self.health = min(self.max_health, self._health + self.health_regen * elapsed)
+        return self._health
+
+    @health.setter
+    def health(self, value):
+        self._health = value
+        self._health_tick = self.model.timers.now
+
+    @property
+    def stamina(self):
+        """Current stamina, including regeneration accrued since it was last set."""
+        elapsed = self.model.timers.now - self._stamina_tick
+        if elapsed > 0:
+            regen = CombatSystem.stamina_regen_rate(self.endurance) * elapsed  # One second per tick
+            self.stamina = min(self.max_stamina, self._stamina + regen)
+        return self._stamina
+
+    @stamina.setter
+    def stamina(self, value):
+        self._stamina = value
+        self._stamina_tick = self.model.timers.now
 
     def equip_basic_gear(self):
         """Equips the agent with basic starting gear."""
-        for slot, item in create_basic_equipment().items():
-            self.equipment.equip(item, slot)
+        self.equipment = basic_equipment()
 
     def learn_skill(self, skill_name):
         """Learns a new skill."""
         skill = get_skill(skill_name)
         if skill and skill not in self.skills:
-            self.skills.append(skill)
-            self.skill_cooldowns[skill.name] = 0
+            self.skills = self.skills + (skill,)
             print(f"{self.unique_id} learned the skill: {skill.name}")
 
+    def skill_ready(self, skill):
+        """Checks whether a skill is off cooldown."""
+        return self.skill_cooldowns is None or self.skill_cooldowns[skill.skill_id] == 0
+
     def use_skill(self, skill_name, target=None):
         """Uses a skill."""
         skill = next((s for s in self.skills if s.name.lower() == skill_name.lower()), None)
-        if skill and self.skill_cooldowns[skill.name] == 0:
+        if skill and self.skill_ready(skill):
             skill.use(self, target)
-            self.skill_cooldowns[skill.name] = skill.cooldown
+            if skill.cooldown > 0:
+                if self.skill_cooldowns is None:
+                    self.skill_cooldowns = [0] * len(get_skill_catalog())
+                self.skill_cooldowns[skill.skill_id] = self.model.timers.schedule(
+                    skill.cooldown, self.end_skill_cooldown, skill.skill_id)
         else:
             print(f"{self.unique_id} can't use {skill_name} at this time.")
 
-    def update_skill_cooldowns(self):
-        """Updates the cooldowns for all skills."""
-        for skill_name in self.skill_cooldowns:
-            if self.skill_cooldowns[skill_name] > 0:
-                self.skill_cooldowns[skill_name] -= 1
-
+    def end_skill_cooldown(self, skill_id):
+        """Timer callback: makes a skill usable again."""
+        self.skill_cooldowns[skill_id] = 0
 
     def move(self, direction):
         """Moves the agent in the specified direction."""
@@ -79,51 +143,63 @@ class SoulslikeAgent(Agent):
         new_y = self.pos[1] + direction[1]
         if self.model.is_valid_move(new_x, new_y):
             self.model.grid.move_agent(self, (new_x, new_y))
-            self.model.apply_environmental_effect(self)
 
     def update_stats(self):
         """Updates the agent's stats based on equipment and level."""
-        self.max_health = 100 + (self.vitality * 10)
-        self.max_stamina = 100 + (self.endurance * 5)
-        self.max_poise = 50 + (self.vitality * 2) + (self.strength * 1)
+        self.max_health, self.max_stamina, self.max_poise = derived_stats(self.strength, self.vitality, self.endurance)
 
     def level_up(self):
         """Increases the agent's level and allows attribute allocation."""
-        self.level += 1
-        self.strength += 1
-        self.dexterity += 1
-        self.vitality += 1
-        self.endurance += 1
-        self.update_stats()
+        ProgressionManager.level_up(self)
 
     def calculate_equip_load(self):
         """Calculates the current equipment load."""
-        return sum(item.weight for item in self.equipment.slots.values() if item is not None)
+        return self.equipment.get_total_weight()
 
     def is_overencumbered(self):
         """Checks if the agent is overencumbered."""
         return self.calculate_equip_load() > self.max_equip_load()
 
     def apply_status_effect(self, effect):
-        """Applies a status effect to the agent."""
+        """Applies a status effect to the agent, refreshing its duration if already active."""
+        effect = as_status_effect(effect)
+        timers = self.model.timers
         if effect not in self.status_effects:
+            if not self.status_effects:
+                self.status_effects = []
             self.status_effects.append(effect)
+            if effect in STATUS_EFFECT_DAMAGE:
+                timers.schedule(1, self.tick_status_effect, effect)
+        if self._status_expiry is None:
+            self._status_expiry = {}
+        self._status_expiry[effect] = timers.schedule(
+            STATUS_EFFECT_DURATIONS[effect], self.expire_status_effect, effect)
+
+    def has_status_effect(self, effect):
+        """Checks if a status effect is currently active."""
+        return as_status_effect(effect) in self.status_effects
+
+    def expire_status_effect(self, effect):
+        """Timer callback: removes a status effect unless it was refreshed since."""
+        if self._status_expiry.get(effect) == self.model.timers.now:
+            del self._status_expiry[effect]
+            self.status_effects.remove(effect)
 
-    def update_status_effects(self):
-        """Updates and removes expired status effects."""
-        for effect in self.status_effects[:]:
-            if effect == StatusEffect.POISON:
-                self.take_damage(5)  # Poison deals 5 damage per turn
-            elif effect == StatusEffect.BURNING:
-                self.take_damage(10)  # Burning deals 10 damage per turn
-            elif effect in [StatusEffect.STAGGERED, StatusEffect.INVULNERABLE, StatusEffect.PARRYING]:
-                self.status_effects.remove(effect)  # These effects last only one turn
+    def tick_status_effect(self, effect):
+        """Timer callback: deals damage over time while the effect is active."""
+        if self.pos is None or effect not in self.status_effects:
+            return
+        self.take_damage(STATUS_EFFECT_DAMAGE[effect])
+        if self.pos is not None:
+            self.model.timers.schedule(1, self.tick_status_effect, effect)
 
     def take_damage(self, amount):
         """Apply damage to the agent."""
         if StatusEffect.INVULNERABLE not in self.status_effects:
             defense = self.equipment.get_total_defense()
             damage_taken = max(1, amount - defense)  # Ensure at least 1 damage is taken
+            if self.model.recorder is not None:
+                self.model.recorder.record_damage(self, damage_taken)
             self.health -= damage_taken
             if self.health <= 0:
                 self.die()
@@ -137,31 +213,43 @@ class SoulslikeAgent(Agent):
         """Calculates the maximum equipment load."""
         return 40 + (self.endurance * 0.5)
 
-    def update_skill_cooldowns(self):
-        """Updates the cooldowns for all skills."""
-        for skill_name in self.skill_cooldowns:
-            if self.skill_cooldowns[skill_name] > 0:
-                self.skill_cooldowns[skill_name] -= 1
-
     def step(self):
-        """The agent's step function, called every tick."""
-        self.update_status_effects()
-        self.update_skill_cooldowns()
-        CombatSystem.regenerate_stamina(self, 1)  # Assuming 1 second per tick
+        """The agent's step function, called every tick.
+
+        Cooldowns and status effects are driven by the model's timer queue and
+        regeneration is applied lazily when health or stamina is read, so there
+        is no per-tick bookkeeping here.
+        """
+
+    def advance(self):
+        """Second stage of a step under Mesa's SimultaneousActivation; unused."""
+
+    def remove(self):
+        """Removes the agent from the model's registry, as mesa.Agent.remove does."""
+        with contextlib.suppress(KeyError):
+            self.model.deregister_agent(self)
+
+    @property
+    def random(self):
+        """The model's random number generator, as on mesa.Agent."""
+        return self.model.random
 
 class Player(SoulslikeAgent):
     """Represents the player character."""
+    __slots__ = ()
+    default_skill_names = ("fireball", "healing_light", "quick_step")
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model, AgentType.PLAYER)
-        self.learn_skill("fireball")
-        self.learn_skill("healing_light")
-        self.learn_skill("quick_step")
 
     def step(self):
         super().step()
+        if self.pos is None:
+            return  # Killed earlier this tick
         # Basic AI for demonstration purposes
-        nearby_enemies = [agent for agent in self.model.grid.get_neighbors(self.pos, moore=True, include_center=False, radius=1)
-                          if isinstance(agent, Enemy)]
+        perception = self.model.perception
+        nearby_enemies = [agent for agent in perception.adjacent_agents(self)
+                          if isinstance(agent, Enemy) and perception.is_adjacent(self, agent)]
         if nearby_enemies:
             target = random.choice(nearby_enemies)
             if self.health < self.max_health * 0.5 and random.random() < 0.3:  # 30% chance to heal if below 50% health
@@ -174,13 +262,14 @@ class Player(SoulslikeAgent):
             possible_steps = self.model.grid.get_neighborhood(self.pos, moore=True, include_center=False)
             new_position = self.random.choice(possible_steps)
             self.model.grid.move_agent(self, new_position)
-            self.model.apply_environmental_effect(self)
 
 class Enemy(SoulslikeAgent):
     """Represents hostile NPCs."""
+    __slots__ = ()
+    default_skill_names = ("fireball",)  # Enemies can use skills too
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model, AgentType.ENEMY)
-        self.learn_skill("fireball")  # Enemies can use skills too
 
     def step(self):
         super().step()
@@ -188,9 +277,11 @@ class Enemy(SoulslikeAgent):
 
 class Neutral(SoulslikeAgent):
     """Represents neutral or friendly NPCs."""
+    __slots__ = ()
+    default_skill_names = ("healing_light",)  # Neutral NPCs might have healing abilities
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model, AgentType.NEUTRAL)
-        self.learn_skill("healing_light")  # Neutral NPCs might have healing abilities
 
     def step(self):
         super().step()
@@ -1,6 +1,7 @@
 from enum import Enum
 import random
 from src.combat_system import CombatSystem, AttackType
+from src.skills import SkillType
 
 class AIState(Enum):
     IDLE = 1
@@ -14,17 +15,51 @@ class AIController:
     def update(agent, world):
         """Updates the AI agent's behavior."""
         from src.agents import Enemy, Neutral, Player  # Lazy import to avoid circular import
-        
-        if isinstance(agent, Enemy):
+
+        if agent.pos is None:
+            return  # Killed earlier this tick
+        if agent.ai_action is not None:
+            AIController.execute(agent, world)
+        elif isinstance(agent, Enemy):
             AIController.update_enemy(agent, world)
         elif isinstance(agent, Neutral):
             AIController.update_neutral(agent, world)
 
+    @staticmethod
+    def execute(agent, world):
+        """Carries out the action the DecisionEngine picked for the agent this tick."""
+        from src.decision_engine import AIAction, ATTACK_ACTIONS  # Lazy import to avoid circular import
+
+        (action, skill_id), target = agent.ai_action, agent.ai_target
+        agent.ai_action = agent.ai_target = None
+        if target is not None and target.pos is None:
+            target = None  # Killed earlier this tick
+
+        skill = world.decisions.skills[skill_id] if action == AIAction.USE_SKILL else None
+        if skill is not None and skill.skill_type != SkillType.OFFENSIVE:
+            agent.use_skill(skill.name)  # Healing and quick step act on the caster, wherever the target is
+        elif action in ATTACK_ACTIONS or skill is not None:
+            # The decision saw the start of the tick; only strike a target that is still alive and in reach
+            if target is None:
+                return
+            if world.get_distance(agent.pos, target.pos) > 1:
+                AIController.chase(agent, target.pos, world)
+            elif skill is not None:
+                agent.use_skill(skill.name, target)
+            else:
+                CombatSystem.attack(agent, target, ATTACK_ACTIONS[action])
+        elif action == AIAction.CHASE and target is not None:
+            AIController.chase(agent, target.pos, world)
+        elif action == AIAction.FLEE and target is not None:
+            AIController.flee(agent, target, world)
+        elif action != AIAction.IDLE:
+            AIController.patrol(agent, world)
+
     @staticmethod
     def update_enemy(agent, world):
         """Updates the behavior of an enemy agent."""
-        target = AIController.find_nearest_player(agent, world)
-        
+        target = world.perception.nearest_player(agent)
+
         if target:
             distance = world.get_distance(agent.pos, target.pos)
             
@@ -1,6 +1,8 @@
 from enum import Enum
 import random
+import numpy as np
 from src.item_system import Weapon, Armor
+from src.progression_system import ProgressionManager
 
 class AttackType(Enum):
     LIGHT = 1
@@ -12,11 +14,15 @@ class DamageType(Enum):
     FIRE = 2
     LIGHTNING = 3
 
+CRITICAL_MULTIPLIER = 1.5
+
 class CombatSystem:
     @staticmethod
     def attack(attacker, target, attack_type):
         """Performs an attack action."""
         if CombatSystem.can_perform_attack(attacker, attack_type):
+            if attacker.model.recorder is not None:
+                attacker.model.recorder.record_attack(attacker, target, attack_type)
             weapon = attacker.equipment.get_equipped_weapon()
             if weapon is None:
                 base_damage = attacker.strength  # Unarmed attack
@@ -30,9 +36,11 @@ class CombatSystem:
                 if CombatSystem.is_attack_parried(target):
                     attacker.take_damage(damage)  # Riposte
                     CombatSystem.apply_poise_damage(attacker, poise_damage)
+                    ProgressionManager.credit_kill(target, attacker)
                 else:
                     target.take_damage(damage)
                     CombatSystem.apply_poise_damage(target, poise_damage)
+                    ProgressionManager.credit_kill(attacker, target)
             
             CombatSystem.consume_stamina(attacker, attack_type)
 
@@ -47,7 +55,11 @@ class CombatSystem:
         """Returns the stamina cost for a given attack type."""
         weapon = attacker.equipment.get_equipped_weapon()
         base_cost = 20 if weapon is None else weapon.attack_speed * 15
+        return CombatSystem.attack_stamina_cost(base_cost, attack_type)
 
+    @staticmethod
+    def attack_stamina_cost(base_cost, attack_type):
+        """Scales a base stamina cost by attack type. Works on scalars and arrays."""
         if attack_type == AttackType.LIGHT:
             return base_cost
         elif attack_type == AttackType.HEAVY:
@@ -85,23 +97,28 @@ class CombatSystem:
     @staticmethod
     def calculate_damage(attacker, target, attack_type, base_damage):
         """Calculates the damage dealt in an attack."""
-        strength_bonus = attacker.strength * 0.5
-        dexterity_bonus = attacker.dexterity * 0.3
-
-        if attack_type == AttackType.LIGHT:
-            damage = base_damage * 1.0 + strength_bonus + dexterity_bonus
-        elif attack_type == AttackType.HEAVY:
-            damage = base_damage * 1.5 + (strength_bonus * 1.5) + dexterity_bonus
-        elif attack_type == AttackType.SKILL:
-            damage = base_damage * 2.0 + strength_bonus + (dexterity_bonus * 1.5)
+        damage = CombatSystem.attack_damage(base_damage, attacker.strength, attacker.dexterity, attack_type)
 
         if CombatSystem.calculate_critical_hit(attacker, target):
-            damage *= 1.5
+            damage *= CRITICAL_MULTIPLIER
 
         defense = target.equipment.get_total_defense()
         final_damage = max(1, damage - defense)  # Ensure at least 1 damage is dealt
         return final_damage
 
+    @staticmethod
+    def attack_damage(base_damage, strength, dexterity, attack_type):
+        """Returns attack damage before critical hits and defense. Works on scalars and arrays."""
+        strength_bonus = strength * 0.5
+        dexterity_bonus = dexterity * 0.3
+
+        if attack_type == AttackType.LIGHT:
+            return base_damage * 1.0 + strength_bonus + dexterity_bonus
+        elif attack_type == AttackType.HEAVY:
+            return base_damage * 1.5 + (strength_bonus * 1.5) + dexterity_bonus
+        elif attack_type == AttackType.SKILL:
+            return base_damage * 2.0 + strength_bonus + (dexterity_bonus * 1.5)
+
     @staticmethod
     def calculate_poise_damage(attacker, attack_type):
         """Calculates the poise damage dealt by an attack."""
@@ -126,25 +143,38 @@ class CombatSystem:
     @staticmethod
     def is_attack_dodged(target):
         """Determines if an attack is dodged."""
-        dodge_chance = min(70, 30 + (target.dexterity * 0.5))
-        return random.random() < dodge_chance / 100
+        return random.random() < CombatSystem.dodge_chance(target.dexterity)
+
+    @staticmethod
+    def dodge_chance(dexterity):
+        """Returns the probability of dodging an attack. Works on scalars and arrays."""
+        return np.minimum(70, 30 + (dexterity * 0.5)) / 100
 
     @staticmethod
     def is_attack_parried(target):
         """Determines if an attack is parried."""
-        return "parrying" in target.status_effects
+        return target.has_status_effect("parrying")
+
+    @staticmethod
+    def stamina_regen_rate(endurance):
+        """Returns the stamina regenerated per second. Works on scalars and arrays."""
+        return 5 + (endurance * 0.1)
 
     @staticmethod
     def regenerate_stamina(agent, delta_time):
         """Regenerates stamina over time."""
-        regen_rate = (5 + (agent.endurance * 0.1)) * delta_time
+        regen_rate = CombatSystem.stamina_regen_rate(agent.endurance) * delta_time
         agent.stamina = min(agent.max_stamina, agent.stamina + regen_rate)
 
     @staticmethod
     def calculate_critical_hit(attacker, target):
         """Determines if an attack is a critical hit."""
-        crit_chance = 5 + (attacker.dexterity * 0.2)
-        return random.random() < crit_chance / 100
+        return random.random() < CombatSystem.critical_chance(attacker.dexterity)
+
+    @staticmethod
+    def critical_chance(dexterity):
+        """Returns the probability of a critical hit. Works on scalars and arrays."""
+        return (5 + (dexterity * 0.2)) / 100
 
     @staticmethod
     def apply_status_effect(attacker, target, effect):
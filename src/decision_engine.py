@@ -0,0 +1,119 @@
+from enum import Enum
+import numpy as np
+from src.agent_types import AgentType
+from src.ai_behavior import AIState
+from src.combat_system import CombatSystem, AttackType
+from src.skills import SkillType, get_skill_catalog
+
+class AIAction(Enum):
+    IDLE = 0
+    LIGHT_ATTACK = 1
+    HEAVY_ATTACK = 2
+    SKILL_ATTACK = 3
+    CHASE = 4
+    PATROL = 5
+    FLEE = 6
+    USE_SKILL = 7  # One score column per skill in the catalog, starting here
+
+ATTACK_ACTIONS = {
+    AIAction.LIGHT_ATTACK: AttackType.LIGHT,
+    AIAction.HEAVY_ATTACK: AttackType.HEAVY,
+    AIAction.SKILL_ATTACK: AttackType.SKILL,
+}
+
+ACTION_STATES = {
+    AIAction.IDLE: AIState.IDLE,
+    AIAction.LIGHT_ATTACK: AIState.ATTACK,
+    AIAction.HEAVY_ATTACK: AIState.ATTACK,
+    AIAction.SKILL_ATTACK: AIState.ATTACK,
+    AIAction.CHASE: AIState.CHASE,
+    AIAction.PATROL: AIState.PATROL,
+    AIAction.FLEE: AIState.FLEE,
+    AIAction.USE_SKILL: AIState.ATTACK,
+}
+
+ACTIONS = list(AIAction)[:AIAction.USE_SKILL.value]
+
+# Utility weights; within a tick an agent picks an action with probability proportional to its weight
+ATTACK_WEIGHT = 0.7  # Share of melee turns spent on weapon attacks, split over affordable attack types
+SKILL_WEIGHT = 0.3  # Share of melee turns spent on skills, split over usable skills
+IDLE_WEIGHT = 1e-9  # Fallback when nothing else is possible, e.g. no stamina to attack
+FLEE_HEALTH = 0.2  # Enemies below this fraction of health flee from their target
+HEAL_HEALTH = 0.5  # Neutrals below this fraction of health heal themselves
+
+class DecisionEngine:
+    """Chooses actions for all enemies and neutrals at once from their state columns.
+
+    decide() gathers health, stamina, target distance, attack costs and skill
+    availability into arrays, scores every action for every agent and samples
+    one action per agent with the Gumbel-max trick. The choice is stored on
+    the agent (ai_action, ai_target, ai_state) and carried out by
+    AIController when the agent steps.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.skills = list(get_skill_catalog().values())  # Indexed by skill_id
+        self.rng = np.random.default_rng(model.random.getrandbits(64))
+
+    def decide(self, agents):
+        """Scores and picks this tick's action for every AI-controlled agent."""
+        agents = [a for a in agents if a.pos is not None and a.agent_type != AgentType.PLAYER]
+        if not agents:
+            return
+        perception = self.model.perception
+        count, skill_count = len(agents), len(self.skills)
+
+        targets = [perception.nearest_player(agent) for agent in agents]
+        has_target = np.array([t is not None for t in targets])
+        distance = np.array([0 if t is None else abs(a.pos[0] - t.pos[0]) + abs(a.pos[1] - t.pos[1])
+                             for a, t in zip(agents, targets)])
+        health = np.array([a.health / a.max_health for a in agents])
+        stamina = np.array([a.stamina for a in agents])
+        is_enemy = np.array([a.agent_type == AgentType.ENEMY for a in agents])
+        base_cost = np.array([CombatSystem.get_stamina_cost(a, AttackType.LIGHT) for a in agents])
+
+        knows = np.zeros((count, skill_count), dtype=np.bool_)
+        cooling = np.zeros((count, skill_count), dtype=np.bool_)
+        for i, agent in enumerate(agents):
+            for skill in agent.skills:
+                knows[i, skill.skill_id] = True
+            if agent.skill_cooldowns is not None:
+                cooling[i] = np.asarray(agent.skill_cooldowns) != 0
+        skill_cost = np.array([skill.stamina_cost for skill in self.skills])
+        usable = knows & ~cooling & (stamina[:, None] >= skill_cost[None, :])
+
+        fleeing = is_enemy & has_target & (health < FLEE_HEALTH)
+        melee = is_enemy & has_target & (distance <= 1) & ~fleeing
+        chasing = is_enemy & has_target & (distance > 1) & ~fleeing
+        healing = ~is_enemy & (health < HEAL_HEALTH)
+        defensive = np.array([skill.skill_type == SkillType.DEFENSIVE for skill in self.skills])
+        heal_options = usable & defensive[None, :] & healing[:, None]
+
+        weights = np.zeros((count, len(ACTIONS) + skill_count))
+        weights[:, AIAction.IDLE.value] = IDLE_WEIGHT
+        for action, attack_type in ATTACK_ACTIONS.items():
+            affordable = stamina >= CombatSystem.attack_stamina_cost(base_cost, attack_type)
+            weights[:, action.value] = np.where(melee & affordable, ATTACK_WEIGHT / len(ATTACK_ACTIONS), 0)
+        skill_options = usable & melee[:, None]
+        weights[:, AIAction.USE_SKILL.value:] = np.where(
+            skill_options, SKILL_WEIGHT / np.maximum(skill_options.sum(axis=1), 1)[:, None], 0)
+        weights[:, AIAction.USE_SKILL.value:] += np.where(
+            heal_options, 1 / np.maximum(heal_options.sum(axis=1), 1)[:, None], 0)
+        weights[:, AIAction.CHASE.value] = chasing
+        weights[:, AIAction.FLEE.value] = fleeing
+        weights[:, AIAction.PATROL.value] = (is_enemy & ~has_target) | (~is_enemy & ~heal_options.any(axis=1))
+
+        with np.errstate(divide="ignore"):
+            scores = np.log(weights) + self.rng.gumbel(size=weights.shape)
+        choices = scores.argmax(axis=1)
+
+        for agent, target, choice in zip(agents, targets, choices.tolist()):
+            if choice >= AIAction.USE_SKILL.value:
+                action, skill_id = AIAction.USE_SKILL, choice - AIAction.USE_SKILL.value
+                if self.skills[skill_id].skill_type != SkillType.OFFENSIVE:
+                    target = None  # Cast on the agent itself, so there is nothing to walk to
+            else:
+                action, skill_id = ACTIONS[choice], None
+            agent.ai_action = (action, skill_id)
+            agent.ai_target = target
+            agent.ai_state = ACTION_STATES[action]
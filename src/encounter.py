@@ -0,0 +1,341 @@
+import numpy as np
+from src.combat_system import CombatSystem, AttackType, CRITICAL_MULTIPLIER
+from src.decision_engine import ATTACK_WEIGHT, SKILL_WEIGHT, FLEE_HEALTH
+from src.item_system import basic_equipment
+from src.progression_system import MAX_LEVEL, get_level_table
+from src.skills import get_skill_catalog
+
+# Outcomes from the point of view of the team. ROUTED: the team survived but
+# the enemies still standing fled, so it is not a kill.
+WIN, LOSS, DRAW, TIMEOUT, ROUTED = 1, -1, 0, 2, 3
+
+ATTACK_TYPES = list(AttackType)
+PLAYER_HEAL_HEALTH = 0.5  # Player.step tries to heal below this fraction of health...
+PLAYER_HEAL_CHANCE = 0.3  # ...with this chance per tick
+BURNING_DURATION = 3  # Ticks after being applied; damage is dealt on the ticks in between
+BURNING_DAMAGE = 10
+SIMULATED_SKILLS = ("fireball", "healing_light", "quick_step")
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score interval for a binomial proportion."""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return float(centre - margin), float(centre + margin)
+
+def quantile_interval(sorted_values, q, z=1.96):
+    """Distribution-free interval for the q-quantile of sorted samples.
+
+    The number of samples below the true quantile is Binomial(n, q), so the
+    order statistics n*q -/+ z*sqrt(n*q*(1-q)) bracket it with about 95%
+    confidence.
+    """
+    n = len(sorted_values)
+    spread = z * np.sqrt(n * q * (1 - q))
+    low = int(np.clip(np.floor(n * q - spread), 0, n - 1))
+    high = int(np.clip(np.ceil(n * q + spread), 0, n - 1))
+    return float(sorted_values[low]), float(sorted_values[high])
+
+class Combatant:
+    """A fighter in an encounter: level, gear and known skills."""
+    def __init__(self, level=1, equipment=None, skills=()):
+        if not 1 <= level <= MAX_LEVEL:
+            raise ValueError(f"Level must be between 1 and {MAX_LEVEL}")
+        self.level = level
+        self.equipment = basic_equipment() if equipment is None else equipment
+        self.skills = tuple(skills)
+        stats = get_level_table()[level]  # An agent that levelled up from 1 with base attributes
+        self.strength = int(stats["strength"])
+        self.dexterity = int(stats["dexterity"])
+        self.vitality = int(stats["vitality"])
+        self.endurance = int(stats["endurance"])
+        self.max_health = float(stats["max_health"])
+        self.max_stamina = float(stats["max_stamina"])
+
+    @classmethod
+    def from_agent(cls, agent):
+        """Copies the current stats, gear and skills of a SoulslikeAgent."""
+        combatant = cls(agent.level, agent.equipment, (skill.name for skill in agent.skills))
+        for name in ("strength", "dexterity", "vitality", "endurance", "max_health", "max_stamina"):
+            setattr(combatant, name, getattr(agent, name))
+        return combatant
+
+def encounter_columns(team, enemies):
+    """Flattens two sides of Combatants into per-fighter stat arrays for the simulation."""
+    fighters = list(team) + list(enemies)
+    if not team or not enemies:
+        raise ValueError("An encounter needs at least one combatant on each side")
+    skill_catalog = get_skill_catalog()
+    knows = np.zeros((len(fighters), len(skill_catalog)), dtype=np.bool_)
+    for i, fighter in enumerate(fighters):
+        for name in fighter.skills:
+            key = name.lower().replace(" ", "_")
+            if key not in SIMULATED_SKILLS:
+                raise ValueError(f"Skill {name!r} is not supported by the encounter simulator")
+            knows[i, skill_catalog[key].skill_id] = True
+
+    weapons = [fighter.equipment.get_equipped_weapon() for fighter in fighters]
+    strength = np.array([f.strength for f in fighters], dtype=np.float64)
+    dexterity = np.array([f.dexterity for f in fighters], dtype=np.float64)
+    base_damage = np.array([f.strength if w is None else w.damage for f, w in zip(fighters, weapons)],
+                           dtype=np.float64)
+    base_cost = np.array([20 if w is None else w.attack_speed * 15 for w in weapons], dtype=np.float64)
+    return {
+        "side": np.array([0] * len(team) + [1] * len(enemies)),
+        "strength": strength,
+        "dexterity": dexterity,
+        "vitality": np.array([f.vitality for f in fighters], dtype=np.float64),
+        "regen": CombatSystem.stamina_regen_rate(np.array([f.endurance for f in fighters], dtype=np.float64)),
+        "max_health": np.array([f.max_health for f in fighters], dtype=np.float64),
+        "max_stamina": np.array([f.max_stamina for f in fighters], dtype=np.float64),
+        "defense": np.array([f.equipment.get_total_defense() for f in fighters], dtype=np.float64),
+        # Rows indexed by attack type, columns by fighter
+        "damage": np.stack([CombatSystem.attack_damage(base_damage, strength, dexterity, t) for t in ATTACK_TYPES]),
+        "cost": np.stack([CombatSystem.attack_stamina_cost(base_cost, t) for t in ATTACK_TYPES]),
+        "dodge": CombatSystem.dodge_chance(dexterity),
+        "critical": CombatSystem.critical_chance(dexterity),
+        "knows": knows,
+    }
+
+def take_damage(amount, defense):
+    """Damage left after SoulslikeAgent.take_damage applies defense (again, after calculate_damage)."""
+    return np.maximum(1, amount - defense)
+
+def simulate_batch(columns, trials, max_ticks, seed):
+    """Runs `trials` independent encounters side by side.
+
+    Each tick every fighter still in the fight regenerates stamina and acts on
+    the state at the start of the tick. Enemies follow the DecisionEngine's
+    melee weights: every affordable attack type gets ATTACK_WEIGHT / 3, usable
+    skills share SKILL_WEIGHT, and an enemy below FLEE_HEALTH flees. With no
+    grid to run on, fleeing leaves the fight for good, as nothing in the model
+    heals an enemy or outruns it; a trial the team survives ends as a WIN only
+    if every enemy died, and as ROUTED if some fled instead. The team follows Player.step: strike a
+    random enemy with a random attack type, or below half health try
+    healing_light with a 30% chance; players never cast fireball or quick
+    step. Enemies strike the first team member still standing. All actions of
+    a tick are resolved simultaneously: heals land first, then damage.
+    Parrying and poise are not modelled because no fighter parries and
+    staggering has no effect.
+
+    State is kept as (fighter, trial) arrays and finished trials are dropped
+    from them as they end. Returns (outcome, ticks, attacks, exhausted) arrays
+    with one entry per trial: attacks counts the team's attack attempts and
+    exhausted those it lacked the stamina for, which Player.step does not
+    check before picking an attack type.
+    """
+    rng = np.random.default_rng(seed)
+    side = columns["side"]
+    fighters = len(side)
+    opponents = [np.flatnonzero(side != side[c]).tolist() for c in range(fighters)]
+    team_columns, enemy_columns = np.flatnonzero(side == 0), np.flatnonzero(side == 1)
+    skill_catalog = get_skill_catalog()
+    skills = list(skill_catalog.values())
+    skill_cost = np.array([skill.stamina_cost for skill in skills], dtype=np.float64)
+    fireball, healing, quick_step = (skill_catalog[name].skill_id for name in SIMULATED_SKILLS)
+    knows = columns["knows"]
+    defense, dodge = columns["defense"], columns["dodge"]
+    max_health, max_stamina = columns["max_health"][:, None], columns["max_stamina"][:, None]
+    regen = columns["regen"][:, None]
+    burning_damage = take_damage(BURNING_DAMAGE, defense)[:, None]
+
+    health = np.repeat(max_health, trials, axis=1)
+    stamina = np.repeat(max_stamina, trials, axis=1)
+    ready_at = np.zeros((fighters, len(skills), trials), dtype=np.int32)
+    burning_until = np.zeros((fighters, trials), dtype=np.int32)
+    fled = np.zeros((fighters, trials), dtype=np.bool_)
+    trial_ids = np.arange(trials)
+    outcome = np.full(trials, TIMEOUT, dtype=np.int8)
+    ticks = np.full(trials, max_ticks, dtype=np.int32)
+    attacks = np.zeros(trials, dtype=np.int32)
+    exhausted = np.zeros(trials, dtype=np.int32)
+
+    for tick in range(max_ticks):
+        count = len(trial_ids)
+        health -= np.where((health > 0) & (burning_until > tick), burning_damage, 0)
+        fighting = (health > 0) & ~fled
+        np.minimum(max_stamina, stamina + regen, out=stamina)
+
+        # Per fighter: action, critical hit, dodge, attack type, target
+        draws = rng.random((fighters, 5, count), dtype=np.float32)
+        incoming = np.zeros((fighters, count))
+        healed = np.zeros((fighters, count))
+        invulnerable = np.zeros((fighters, count), dtype=np.bool_)
+        for c in range(fighters):
+            target = np.full(count, -1)
+            if side[c] == 0:
+                # random.choice among the adjacent enemies
+                standing = fighting[opponents[c]]
+                pick_target = (draws[c, 4] * standing.sum(axis=0)).astype(np.intp)
+                chosen = standing & (np.cumsum(standing, axis=0) == pick_target + 1)
+                for o, row in zip(opponents[c], chosen):
+                    target = np.where(row, o, target)
+            else:
+                for o in reversed(opponents[c]):
+                    target = np.where(fighting[o], o, target)
+            acting = fighting[c] & (target >= 0)
+            target_defense = defense[target]
+            known = np.flatnonzero(knows[c])
+            usable = (ready_at[c, known] <= tick) & (stamina[c] >= skill_cost[known, None])
+            cost = columns["cost"][:, c, None]
+
+            if side[c] == 0:
+                heal = acting & (health[c] < max_health[c] * PLAYER_HEAL_HEALTH) & (draws[c, 0] < PLAYER_HEAL_CHANCE)
+                pick = np.full(count, healing)
+                use_skill = heal & usable[known == healing].any(axis=0)  # Otherwise the turn is wasted
+                attack = acting & ~heal
+                attack_type = (draws[c, 3] * len(ATTACK_TYPES)).astype(np.intp)
+                hit = attack & (stamina[c] >= cost[attack_type, 0])
+                attacks[trial_ids] += attack
+                exhausted[trial_ids] += attack & ~hit
+            else:
+                fleeing = acting & (health[c] < max_health[c] * FLEE_HEALTH)
+                fled[c] |= fleeing
+                acting &= ~fleeing
+                # Sample in proportion to the DecisionEngine's weights; IDLE when none is positive
+                weights = np.concatenate([
+                    np.where(stamina[c] >= cost, ATTACK_WEIGHT / len(ATTACK_TYPES), 0),
+                    usable * (SKILL_WEIGHT / np.maximum(usable.sum(axis=0), 1)),
+                ])
+                cumulative = np.cumsum(weights, axis=0)
+                choice = (cumulative < draws[c, 0] * cumulative[-1]).sum(axis=0)
+                acting &= cumulative[-1] > 0
+                hit = acting & (choice < len(ATTACK_TYPES))
+                attack_type = np.minimum(choice, len(ATTACK_TYPES) - 1)
+                use_skill = acting & ~hit
+                pick = known[np.clip(choice - len(ATTACK_TYPES), 0, len(known) - 1)] if len(known) else choice
+
+            stamina[c] = np.where(hit, np.maximum(0, stamina[c] - columns["cost"][attack_type, c]), stamina[c])
+            damage = columns["damage"][attack_type, c] * np.where(
+                draws[c, 1] < columns["critical"][c], CRITICAL_MULTIPLIER, 1)
+            damage = take_damage(np.maximum(1, damage - target_defense), target_defense)
+            landed = hit & (draws[c, 2] >= dodge[target])
+            for o in opponents[c]:
+                incoming[o] += np.where(landed & (target == o), damage, 0)
+
+            if knows[c, fireball]:
+                cast = use_skill & (pick == fireball)
+                stamina[c] -= np.where(cast, skill_cost[fireball], 0)
+                ready_at[c, fireball] = np.where(cast, tick + skill_catalog["fireball"].cooldown, ready_at[c, fireball])
+                damage = take_damage(20 + columns["strength"][c] * 0.5, target_defense)
+                for o in opponents[c]:
+                    struck = cast & (target == o)
+                    incoming[o] += np.where(struck, damage, 0)
+                    burning_until[o] = np.where(struck, tick + BURNING_DURATION, burning_until[o])
+            if knows[c, healing]:
+                cast = use_skill & (pick == healing)
+                stamina[c] -= np.where(cast, skill_cost[healing], 0)
+                ready_at[c, healing] = np.where(cast, tick + skill_catalog["healing_light"].cooldown,
+                                                ready_at[c, healing])
+                healed[c] = np.where(cast, 30 + columns["vitality"][c] * 0.5, 0)
+            if knows[c, quick_step]:
+                cast = use_skill & (pick == quick_step)
+                stamina[c] -= np.where(cast, skill_cost[quick_step], 0)
+                ready_at[c, quick_step] = np.where(cast, tick + skill_catalog["quick_step"].cooldown,
+                                                   ready_at[c, quick_step])
+                dodge_cost = 20 - columns["dexterity"][c] * 0.2
+                invulnerable[c] = cast & (stamina[c] >= dodge_cost)
+                stamina[c] -= np.where(invulnerable[c], dodge_cost, 0)
+
+        alive = health > 0
+        health = np.where(alive, np.minimum(max_health, health + healed), health)
+        health -= np.where(invulnerable, 0, incoming)
+        alive = health > 0
+
+        team_alive = alive[team_columns].any(axis=0)
+        enemies_alive = alive[enemy_columns]
+        enemies_fighting = (enemies_alive & ~fled[enemy_columns]).any(axis=0)
+        finished = ~(team_alive & enemies_fighting)
+        if finished.any():
+            ended = trial_ids[finished]
+            survived = np.where(enemies_alive.any(axis=0), ROUTED, WIN)
+            outcome[ended] = np.where(team_alive, survived, np.where(enemies_fighting, LOSS, DRAW))[finished]
+            ticks[ended] = tick + 1
+            keep = ~finished
+            trial_ids = trial_ids[keep]
+            if not len(trial_ids):
+                break
+            health, stamina, fled = health[:, keep], stamina[:, keep], fled[:, keep]
+            ready_at, burning_until = ready_at[:, :, keep], burning_until[:, keep]
+    return outcome, ticks, attacks, exhausted
+
+class EncounterResult:
+    """Per-trial outcomes of an encounter with summary statistics."""
+    def __init__(self, outcome, ticks, attacks, exhausted):
+        self.outcome = outcome
+        self.ticks = ticks
+        self.attacks = attacks
+        self.exhausted = exhausted
+
+    @classmethod
+    def merge(cls, results):
+        results = list(results)
+        return cls(np.concatenate([r.outcome for r in results]),
+                   np.concatenate([r.ticks for r in results]),
+                   np.concatenate([r.attacks for r in results]),
+                   np.concatenate([r.exhausted for r in results]))
+
+    @property
+    def trials(self):
+        return len(self.outcome)
+
+    def rate(self, outcome):
+        """Fraction of trials with the given outcome and its 95% Wilson interval."""
+        count = int(np.count_nonzero(self.outcome == outcome))
+        return count / self.trials, wilson_interval(count, self.trials)
+
+    def time_to_kill(self, percentiles=(5, 25, 50, 75, 95)):
+        """Percentiles of the ticks the team needed to kill every enemy, with 95% intervals.
+
+        Returns {percentile: (ticks, (low, high))}, or None if the team never
+        won. Routs are left out: the fight ended without the kill.
+        """
+        wins = np.sort(self.ticks[self.outcome == WIN])
+        if not len(wins):
+            return None
+        values = np.percentile(wins, percentiles).tolist()
+        return {p: (value, quantile_interval(wins, p / 100)) for p, value in zip(percentiles, values)}
+
+    def exhaustion_rate(self):
+        """Fraction of trials in which the team ran out of stamina for an attack at least once."""
+        count = int(np.count_nonzero(self.exhausted))
+        return count / self.trials, wilson_interval(count, self.trials)
+
+    def summary(self):
+        lines = [f"trials:            {self.trials}"]
+        for name, outcome in (("win", WIN), ("routed", ROUTED), ("loss", LOSS), ("draw", DRAW),
+                              ("timeout", TIMEOUT)):
+            rate, (low, high) = self.rate(outcome)
+            lines.append(f"{name + ' rate:':<19}{rate:.4f} (95% CI {low:.4f}-{high:.4f})")
+        ttk = self.time_to_kill()
+        if ttk is not None:
+            lines.append("time to kill:      " + ", ".join(
+                f"p{p}={value:g} ({low:g}-{high:g})" for p, (value, (low, high)) in ttk.items()))
+        rate, (low, high) = self.exhaustion_rate()
+        lines.append(f"stamina exhausted: {rate:.4f} (95% CI {low:.4f}-{high:.4f}), "
+                     f"{self.exhausted.mean():.2f} ticks per trial, "
+                     f"{self.exhausted.sum() / max(self.attacks.sum(), 1):.1%} of the team's attacks")
+        return "\n".join(lines)
+
+def simulate_encounter(team, enemies, trials, max_ticks=300, seed=0, batch_size=100000, workers=None):
+    """Runs `trials` encounters between two lists of Combatants without a grid or Mesa.
+
+    Trials are split into batches with independent seeds, so the result does
+    not depend on `workers`; with workers > 1 the batches run in a process pool.
+    One core manages roughly 10-30k encounters per second depending on the
+    number of fighters, so a million trials take about a minute per core.
+    """
+    columns = encounter_columns(team, enemies)
+    sizes = [batch_size] * (trials // batch_size) + ([trials % batch_size] if trials % batch_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = ([columns] * len(sizes), sizes, [max_ticks] * len(sizes), seeds)
+    if workers and workers > 1:
+        from concurrent.futures import ProcessPoolExecutor  # Lazy import: only needed with a process pool
+        with ProcessPoolExecutor(workers) as pool:
+            batches = list(pool.map(simulate_batch, *args))
+    else:
+        batches = list(map(simulate_batch, *args))
+    return EncounterResult.merge(EncounterResult(*batch) for batch in batches)
@@ -1,22 +1,12 @@
 from mesa import Model
 from mesa.space import MultiGrid
+import heapq
 import numpy as np
-from enum import Enum
-
-class TerrainType(Enum):
-    DEFAULT = 0
-    GRASS = 1
-    STONE = 2
-    WATER = 3
-    LAVA = 4
-    POISON_SWAMP = 5
-
-class ObstacleType(Enum):
-    WALL = 0
-    TREE = 1
-    ROCK = 2
-    CHEST = 3
-    BONFIRE = 4
+from src.agent_types import StatusEffect
+from src.free_cells import FreeCellIndex
+from src.terrain import (TerrainType, ObstacleType, TERRAIN_WEIGHTS, OBSTACLE_WEIGHTS, OBSTACLE_DENSITY,
+                         BONFIRE_DENSITY, LAVA_DAMAGE)
+from src.timers import TimerQueue
 
 class Cell:
     """Represents a single cell in the world grid."""
@@ -26,15 +16,133 @@ class Cell:
         self.terrain_type = terrain_type
         self.obstacle = None
 
+class IndexedMultiGrid(MultiGrid):
+    """MultiGrid that keeps the world's free-cell index up to date as agents come and go."""
+    free_cells = None
+
+    def place_agent(self, agent, pos):
+        super().place_agent(agent, pos)
+        if self.free_cells is not None:
+            self.free_cells.claim(pos)
+
+    def remove_agent(self, agent):
+        pos = agent.pos
+        super().remove_agent(agent)
+        if self.free_cells is not None and self.is_cell_empty(pos):
+            self.free_cells.release(pos)
+
+class SparseGrid:
+    """Grid for chunked worlds that only stores occupied cells.
+
+    MultiGrid allocates a list for every cell up front, which makes startup
+    time and memory grow with map area. This grid keeps occupants in a dict
+    keyed by position instead, so its cost grows with the number of agents.
+    It is not a Mesa grid: it offers the MultiGrid methods the simulation
+    uses, with the same results and neighbourhood order.
+    """
+    free_cells = None  # Chunked worlds have no free-cell index
+
+    def __init__(self, width, height, torus):
+        self.width = width
+        self.height = height
+        self.torus = torus
+        self.occupied = {}  # (x, y) -> list of agents, removed again when the cell empties
+
+    def out_of_bounds(self, pos):
+        x, y = pos
+        return x < 0 or x >= self.width or y < 0 or y >= self.height
+
+    def torus_adj(self, pos):
+        """Wraps a position onto the grid, as MultiGrid.torus_adj does."""
+        if not self.out_of_bounds(pos):
+            return pos
+        if not self.torus:
+            raise ValueError(f"Position {pos} is outside the grid")
+        return pos[0] % self.width, pos[1] % self.height
+
+    def place_agent(self, agent, pos):
+        pos = tuple(pos)
+        cell = self.occupied.setdefault(pos, [])
+        if agent.pos is None or agent not in cell:
+            cell.append(agent)
+            agent.pos = pos
+
+    def remove_agent(self, agent):
+        pos = tuple(agent.pos)
+        cell = self.occupied[pos]
+        cell.remove(agent)
+        if not cell:
+            del self.occupied[pos]
+        agent.pos = None
+
+    def move_agent(self, agent, pos):
+        pos = self.torus_adj(pos)
+        self.remove_agent(agent)
+        self.place_agent(agent, pos)
+
+    def is_cell_empty(self, pos):
+        return tuple(pos) not in self.occupied
+
+    def get_cell_list_contents(self, cell_list):
+        """Returns the agents in the given cells."""
+        return [agent for pos in cell_list for agent in self.occupied.get(tuple(pos), ())]
+
+    def get_neighborhood(self, pos, moore, include_center=False, radius=1):
+        """Returns the cells around pos in the order MultiGrid.get_neighborhood gives them."""
+        if self.out_of_bounds(pos):
+            raise ValueError(f"Position {pos} is outside the grid")
+        x, y = pos
+        neighborhood = {}  # Insertion-ordered; wrapped positions can repeat on small toroidal grids
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                if not moore and abs(dx) + abs(dy) > radius:
+                    continue
+                new_x, new_y = x + dx, y + dy
+                if self.torus:
+                    new_x, new_y = new_x % self.width, new_y % self.height
+                if not self.out_of_bounds((new_x, new_y)):
+                    neighborhood[(new_x, new_y)] = True
+        if not include_center:
+            neighborhood.pop(tuple(pos), None)
+        return tuple(neighborhood)
+
 class World(Model):
-    """Represents the game world."""
-    def __init__(self, width, height):
+    """Represents the game world.
+
+    By default every cell is allocated and generated up front. Passing
+    chunk_size switches to a chunked world whose terrain is generated
+    deterministically per chunk on first access; max_chunks bounds how many
+    chunks stay in memory and spill_dir lets modified chunks be evicted to disk.
+    Passing layers (a WorldLayers, e.g. attached from shared memory) reuses an
+    already generated map instead of generating one.
+    """
+    def __init__(self, width, height, chunk_size=None, max_chunks=None, spill_dir=None, layers=None):
         super().__init__()
+        if layers is not None:
+            width, height = layers.width, layers.height
+            chunk_size = None
         self.width = width
         self.height = height
-        self.grid = MultiGrid(width, height, True)
-        self.cells = [[Cell(x, y) for y in range(height)] for x in range(width)]
-        self.initialize_world()
+        # Chunked worlds can be far larger than any grid that allocates every cell
+        grid_class = SparseGrid if chunk_size else IndexedMultiGrid
+        self.grid = grid_class(width, height, True)
+        self.timers = TimerQueue()
+        self.recorder = None  # ReplayRecorder attached to this world, if any
+        self.experience_awards = []  # (agent, experience) earned this tick, awarded in one batch at its end
+        self.chunk_size = chunk_size
+        self.layers = layers
+        self._terrain_codes = None
+        self._walkable = None
+        if layers is not None:
+            from src.world_layers import LayerCells  # Lazy import to avoid circular import
+            self.cells = LayerCells(layers)
+        elif chunk_size:
+            from src.world_chunks import ChunkedCells  # Lazy import to avoid circular import
+            self.world_seed = self.random.getrandbits(32)
+            self.cells = ChunkedCells(width, height, chunk_size, self.world_seed, max_chunks, spill_dir)
+        else:
+            self.cells = [[Cell(x, y) for y in range(height)] for x in range(width)]
+            self.initialize_world()
 
     def initialize_world(self):
         """Initialize the world with terrain and obstacles."""
@@ -46,21 +154,21 @@ class World(Model):
         """Generate terrain for the world."""
         for x in range(self.width):
             for y in range(self.height):
-                terrain_type = np.random.choice(list(TerrainType), p=[0.6, 0.2, 0.1, 0.05, 0.03, 0.02])
+                terrain_type = np.random.choice(list(TerrainType), p=TERRAIN_WEIGHTS)
                 self.set_terrain(x, y, terrain_type)
 
     def place_obstacles(self):
         """Place obstacles in the world."""
-        num_obstacles = int(self.width * self.height * 0.1)  # 10% of cells have obstacles
+        num_obstacles = int(self.width * self.height * OBSTACLE_DENSITY)
         for _ in range(num_obstacles):
             x, y = self.random.randrange(self.width), self.random.randrange(self.height)
             if not self.cells[x][y].obstacle:
-                obstacle_type = np.random.choice(list(ObstacleType), p=[0.4, 0.3, 0.2, 0.1, 0])
+                obstacle_type = np.random.choice(list(ObstacleType), p=OBSTACLE_WEIGHTS)
                 self.add_obstacle(x, y, obstacle_type)
 
     def place_bonfires(self):
         """Place bonfires in the world."""
-        num_bonfires = max(1, int(self.width * self.height * 0.01))  # At least 1 bonfire, up to 1% of cells
+        num_bonfires = max(1, int(self.width * self.height * BONFIRE_DENSITY))  # At least 1 bonfire
         for _ in range(num_bonfires):
             x, y = self.random.randrange(self.width), self.random.randrange(self.height)
             if not self.cells[x][y].obstacle:
@@ -69,33 +177,167 @@ class World(Model):
     def add_obstacle(self, x, y, obstacle_type):
         """Adds an obstacle to the world."""
         self.cells[x][y].obstacle = obstacle_type
+        if self.chunk_size:
+            self.cells.mark_dirty(x, y)
+        if self._walkable is not None:
+            self._walkable[x, y] = self.is_valid_move(x, y)
+        # Layer-backed cells update layers.walkable themselves; either way the
+        # free-cell index must follow the cell's new walkability
+        free_cells = self.grid.free_cells
+        if free_cells is not None:
+            if not self.is_valid_move(x, y):
+                free_cells.claim((x, y))
+            elif self.grid.is_cell_empty((x, y)):
+                free_cells.release((x, y))
 
     def set_terrain(self, x, y, terrain_type):
         """Sets the terrain type for a cell."""
         self.cells[x][y].terrain_type = terrain_type
+        if self.chunk_size:
+            self.cells.mark_dirty(x, y)
+        if self._terrain_codes is not None:
+            self._terrain_codes[x, y] = terrain_type.value
+
+    def terrain_codes(self):
+        """Returns an array of TerrainType values indexed [x, y], or None for chunked worlds."""
+        if self.layers is not None:
+            return self.layers.terrain
+        if self.chunk_size:
+            return None  # Building it would generate every chunk
+        if self._terrain_codes is None:
+            self._terrain_codes = np.array([[cell.terrain_type.value for cell in column] for column in self.cells],
+                                           dtype=np.int8)
+        return self._terrain_codes
+
+    def walkable_mask(self):
+        """Returns a boolean array of walkable cells indexed [x, y], or None for chunked worlds."""
+        if self.layers is not None:
+            return self.layers.walkable
+        if self.chunk_size:
+            return None  # Building it would generate every chunk
+        if self._walkable is None:
+            self._walkable = np.array([[self.is_valid_move(x, y) for y in range(self.height)]
+                                       for x in range(self.width)], dtype=np.bool_)
+        return self._walkable
+
+    def get_free_cells(self):
+        """Returns the index of walkable, unoccupied cells, building it on first use.
+
+        Returns None for chunked worlds, where indexing every cell would
+        generate the whole map.
+        """
+        if self.grid.free_cells is None:
+            walkable = self.walkable_mask()
+            if walkable is None:
+                return None
+            free_cells = FreeCellIndex(walkable)
+            for agent in self.agents:
+                if agent.pos is not None:
+                    free_cells.claim(agent.pos)
+            self.grid.free_cells = free_cells
+        return self.grid.free_cells
 
     def is_valid_move(self, x, y):
         """Check if a move to (x, y) is valid."""
         if 0 <= x < self.width and 0 <= y < self.height:
+            if self.layers is not None:
+                return bool(self.layers.walkable[x, y])
             return not self.cells[x][y].obstacle or self.cells[x][y].obstacle == ObstacleType.BONFIRE
         return False
 
-    def get_path(self, start, end):
-        """Finds a path between two points using A* algorithm."""
-        # Implement A* algorithm here
-        pass
+    def get_path(self, start, end, max_nodes=1000):
+        """Finds a path between two points using A* algorithm.
+
+        Returns the list of positions from start to end inclusive, or None if
+        no path is found within max_nodes expansions. Only cells the search
+        touches are looked up, so chunked worlds load just the chunks on the way.
+        """
+        if start is None or end is None:
+            return None
+        start, end = tuple(start), tuple(end)
+        open_set = [(self.get_distance(start, end), 0, start)]  # (f, -g, pos): ties favour deeper nodes
+        came_from = {start: None}
+        cost = {start: 0}
+        expanded = 0
+        while open_set and expanded < max_nodes:
+            _, neg_g, current = heapq.heappop(open_set)
+            g = -neg_g
+            if current == end:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                return path[::-1]
+            if g > cost[current]:
+                continue  # Stale entry
+            expanded += 1
+            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+                neighbor = (current[0] + dx, current[1] + dy)
+                if neighbor not in cost or g + 1 < cost[neighbor]:
+                    if neighbor != end and not self.is_valid_move(*neighbor):
+                        continue  # The goal itself may be an obstacle cell a target wandered onto
+                    cost[neighbor] = g + 1
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (g + 1 + self.get_distance(neighbor, end), -(g + 1), neighbor))
+        return None
 
     def apply_environmental_effect(self, agent):
         """Applies environmental effects to an agent."""
         x, y = agent.pos
         terrain = self.cells[x][y].terrain_type
         if terrain == TerrainType.LAVA:
-            agent.take_damage(10)  # Lava deals 10 damage per step
+            agent.take_damage(LAVA_DAMAGE)
         elif terrain == TerrainType.POISON_SWAMP:
             agent.apply_status_effect("poison")  # Apply poison effect
         elif terrain == TerrainType.WATER:
             agent.apply_status_effect("wet")  # Apply wet effect
 
+    def apply_environmental_effects(self, agents):
+        """Applies environmental effects to many agents in one batched pass.
+
+        Positions are gathered into arrays and terrain is looked up with one
+        fancy-indexing operation; lava damage is applied as an array operation
+        and only the agents standing on poison swamp or water are visited.
+        Each agent is affected at most once per call.
+        """
+        agents = [agent for agent in agents if agent.pos is not None]
+        if not agents:
+            return
+        xs, ys = np.array([agent.pos for agent in agents]).T
+        codes = self.terrain_codes()
+        if codes is None:
+            terrain = np.array([self.cells[x][y].terrain_type.value for x, y in zip(xs, ys)], dtype=np.int8)
+        else:
+            terrain = codes[xs, ys]
+        on_lava = np.flatnonzero(terrain == TerrainType.LAVA.value)
+        if len(on_lava):
+            self.apply_lava_damage([agents[i] for i in on_lava])
+        for i in np.flatnonzero(terrain == TerrainType.POISON_SWAMP.value):
+            agents[i].apply_status_effect("poison")
+        for i in np.flatnonzero(terrain == TerrainType.WATER.value):
+            agents[i].apply_status_effect("wet")
+
+    def apply_lava_damage(self, agents):
+        """Applies one tick of lava damage to every agent in the list at once.
+
+        Defense, invulnerability and the new health follow
+        SoulslikeAgent.take_damage but are computed as arrays. Agents keep
+        their own health, so the results are written back one attribute at a
+        time, and only the agents that died are removed.
+        """
+        defense = np.array([agent.equipment.get_total_defense() for agent in agents])
+        invulnerable = np.array([StatusEffect.INVULNERABLE in agent.status_effects for agent in agents])
+        damage = np.where(invulnerable, 0, np.maximum(1, LAVA_DAMAGE - defense))
+        health = np.array([agent.health for agent in agents]) - damage
+        for agent, value in zip(agents, health.tolist()):
+            agent.health = value
+        if self.recorder is not None:
+            amounts = damage.tolist()
+            for i in np.flatnonzero(~invulnerable):
+                self.recorder.record_damage(agents[i], amounts[i])
+        for i in np.flatnonzero(health <= 0):
+            agents[i].die()
+
     def get_distance(self, pos1, pos2):
         """Calculate the Manhattan distance between two positions."""
         if pos1 is None or pos2 is None:
@@ -0,0 +1,72 @@
+import numpy as np
+
+class FreeCellIndex:
+    """Set of walkable, unoccupied cells supporting O(1) random draws.
+
+    Cells are stored by id (x * height + y) in a dense array; slot_of maps a
+    cell id back to its position in that array so cells can be claimed or
+    released in O(1) with swap-remove.
+    """
+    def __init__(self, walkable):
+        self.width, self.height = walkable.shape
+        self.walkable = walkable
+        self.cells = np.flatnonzero(walkable).astype(np.int64)
+        self.slot_of = np.full(walkable.size, -1, dtype=np.int64)
+        self.slot_of[self.cells] = np.arange(len(self.cells))
+        self.size = len(self.cells)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, pos):
+        return self.slot_of[pos[0] * self.height + pos[1]] >= 0
+
+    def claim(self, pos):
+        """Removes a cell from the index, e.g. because an agent entered it."""
+        cell = pos[0] * self.height + pos[1]
+        slot = self.slot_of[cell]
+        if slot < 0:
+            return
+        last = self.cells[self.size - 1]
+        self.cells[slot] = last
+        self.slot_of[last] = slot
+        self.slot_of[cell] = -1
+        self.size -= 1
+
+    def release(self, pos):
+        """Adds a cell back to the index if it is walkable, e.g. because its last agent left."""
+        cell = pos[0] * self.height + pos[1]
+        if self.slot_of[cell] >= 0 or not self.walkable[pos[0], pos[1]]:
+            return
+        self.cells[self.size] = cell
+        self.slot_of[cell] = self.size
+        self.size += 1
+
+    def take(self, rng):
+        """Draws and claims one free cell uniformly at random; rng is a random.Random."""
+        if not self.size:
+            raise ValueError("No free walkable cells left to place an agent")
+        cell = int(self.cells[rng.randrange(self.size)])
+        pos = divmod(cell, self.height)
+        self.claim(pos)
+        return pos
+
+    def take_many(self, count, rng):
+        """Draws and claims `count` distinct free cells; rng is a numpy Generator.
+
+        Returns arrays of x and y coordinates.
+        """
+        if count > self.size:
+            raise ValueError(f"Cannot place {count} agents: only {self.size} free walkable cells left")
+        slots = rng.choice(self.size, size=count, replace=False)
+        chosen = self.cells[slots]
+        # Fill the chosen slots below the new size with the unchosen cells from the tail
+        new_size = self.size - count
+        holes = slots[slots < new_size]
+        tail = np.arange(new_size, self.size)
+        movers = self.cells[tail[~np.isin(tail, slots)]]
+        self.cells[holes] = movers
+        self.slot_of[movers] = holes
+        self.slot_of[chosen] = -1
+        self.size = new_size
+        return np.divmod(chosen, self.height)
@@ -14,6 +14,8 @@ class EquipmentSlot(Enum):
     FEET = 6
 
 class Item:
+    __slots__ = ("name", "item_type", "weight", "value")
+
     def __init__(self, name, item_type, weight, value):
         self.name = name
         self.item_type = item_type
@@ -21,18 +23,24 @@ class Item:
         self.value = value
 
 class Weapon(Item):
+    __slots__ = ("damage", "attack_speed")
+
     def __init__(self, name, damage, attack_speed, weight, value):
         super().__init__(name, ItemType.WEAPON, weight, value)
         self.damage = damage
         self.attack_speed = attack_speed
 
 class Armor(Item):
+    __slots__ = ("defense", "slot")
+
     def __init__(self, name, defense, slot, weight, value):
         super().__init__(name, ItemType.ARMOR, weight, value)
         self.defense = defense
         self.slot = slot
 
 class Consumable(Item):
+    __slots__ = ("effect",)
+
     def __init__(self, name, effect, weight, value):
         super().__init__(name, ItemType.CONSUMABLE, weight, value)
         self.effect = effect
@@ -41,6 +49,8 @@ class Consumable(Item):
         self.effect(agent)
 
 class Inventory:
+    __slots__ = ("items", "capacity")
+
     def __init__(self, capacity):
         self.items = []
         self.capacity = capacity
@@ -60,35 +70,94 @@ class Inventory:
     def get_weight(self):
         return sum(item.weight for item in self.items)
 
+SLOT_ORDER = list(EquipmentSlot)
+
 class Equipment:
+    """Equipped items, stored in a list indexed by EquipmentSlot order.
+
+    Total defense is kept up to date on equip/unequip because it is read on
+    every hit.
+    """
+    __slots__ = ("items", "total_defense")
+
     def __init__(self):
-        self.slots = {slot: None for slot in EquipmentSlot}
+        self.items = [None] * len(SLOT_ORDER)
+        self.total_defense = 0
+
+    @property
+    def slots(self):
+        """Mapping of every EquipmentSlot to its item (or None)."""
+        return dict(zip(SLOT_ORDER, self.items))
+
+    def copy(self):
+        """Returns an Equipment holding the same (shared) items."""
+        equipment = Equipment.__new__(Equipment)
+        equipment.items = self.items[:]
+        equipment.total_defense = self.total_defense
+        return equipment
 
     def equip(self, item, slot):
         if isinstance(item, Weapon) and slot in [EquipmentSlot.MAIN_HAND, EquipmentSlot.OFF_HAND]:
-            self.slots[slot] = item
+            self.set_item(slot, item)
             return True
         elif isinstance(item, Armor) and item.slot == slot:
-            self.slots[slot] = item
+            self.set_item(slot, item)
             return True
         return False
 
     def unequip(self, slot):
-        item = self.slots[slot]
-        self.slots[slot] = None
+        item = self.items[slot.value - 1]
+        self.set_item(slot, None)
         return item
 
+    def set_item(self, slot, item):
+        self.items[slot.value - 1] = item
+        self.total_defense = sum(i.defense for i in self.items if isinstance(i, Armor))
+
     def get_total_defense(self):
-        return sum(item.defense for item in self.slots.values() if isinstance(item, Armor))
+        return self.total_defense
 
-    def get_equipped_weapon(self):
-        return self.slots[EquipmentSlot.MAIN_HAND]
+    def get_total_weight(self):
+        return sum(item.weight for item in self.items if item is not None)
 
-# Example items
-sword = Weapon("Iron Sword", damage=10, attack_speed=1.0, weight=5, value=50)
-shield = Armor("Wooden Shield", defense=5, slot=EquipmentSlot.OFF_HAND, weight=3, value=30)
-helmet = Armor("Leather Helmet", defense=3, slot=EquipmentSlot.HEAD, weight=2, value=25)
-health_potion = Consumable("Health Potion", effect=lambda agent: setattr(agent, 'health', min(agent.health + 50, agent.max_health)), weight=0.5, value=20)
+    def get_equipped_weapon(self):
+        return self.items[EquipmentSlot.MAIN_HAND.value - 1]
+
+_example_items = None
+
+def example_items():
+    """Returns the example items by name, creating them on first use."""
+    global _example_items
+    if _example_items is None:
+        _example_items = {
+            "sword": Weapon("Iron Sword", damage=10, attack_speed=1.0, weight=5, value=50),
+            "shield": Armor("Wooden Shield", defense=5, slot=EquipmentSlot.OFF_HAND, weight=3, value=30),
+            "helmet": Armor("Leather Helmet", defense=3, slot=EquipmentSlot.HEAD, weight=2, value=25),
+            "health_potion": Consumable("Health Potion", effect=lambda agent: setattr(agent, 'health', min(agent.health + 50, agent.max_health)), weight=0.5, value=20),
+        }
+    return _example_items
+
+def __getattr__(name):
+    # Example items such as `sword` stay importable but are only created when first accessed
+    items = example_items()
+    if name in items:
+        return items[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+_basic_equipment = None
+
+def basic_equipment():
+    """Returns a new Equipment with the basic starting gear.
+
+    The gear items are created once and shared by every agent that starts
+    with them; they are never modified in place.
+    """
+    global _basic_equipment
+    if _basic_equipment is None:
+        _basic_equipment = Equipment()
+        for slot, item in create_basic_equipment().items():
+            _basic_equipment.equip(item, slot)
+    return _basic_equipment.copy()
 
 def create_basic_equipment():
     """Creates a set of basic equipment for new agents."""
@@ -0,0 +1,94 @@
+from mesa.time import RandomActivation
+import numpy as np
+from src.environment import World
+from src.agents import create_agent, AgentType
+from src.progression_system import ProgressionManager
+from src.perception import Perception
+from src.decision_engine import DecisionEngine
+
+class SoulslikeModel(World):
+    """A model with some number of agents."""
+    def __init__(self, width, height, num_players, num_enemies, num_neutrals,
+                 chunk_size=None, max_chunks=None, spill_dir=None, layers=None):
+        super().__init__(width, height, chunk_size, max_chunks, spill_dir, layers)
+        self.schedule = RandomActivation(self)
+        self.perception = Perception(self)
+        self.decisions = DecisionEngine(self)
+        self.num_players = num_players
+        self.num_enemies = num_enemies
+        self.num_neutrals = num_neutrals
+        self.initialize_agents()
+
+    def initialize_agents(self):
+        """Initialize agents in the world."""
+        for agent_type, count in [
+            (AgentType.PLAYER, self.num_players),
+            (AgentType.ENEMY, self.num_enemies),
+            (AgentType.NEUTRAL, self.num_neutrals)
+        ]:
+            self.spawn_agents(agent_type, count)
+
+    def spawn_agents(self, agent_type, count):
+        """Creates `count` agents of one type and places each on its own free cell.
+
+        Positions are drawn in one batch without replacement from the free-cell
+        index. Raises ValueError if there are fewer free walkable cells than
+        agents requested.
+        """
+        free_cells = self.get_free_cells()
+        if free_cells is None:
+            agents = [create_agent(agent_type, self.next_id(), self) for _ in range(count)]
+            for agent in agents:
+                self.place_agent(agent)
+                self.schedule.add(agent)
+            return agents
+        rng = np.random.default_rng(self.random.getrandbits(64))
+        xs, ys = free_cells.take_many(count, rng)
+        agents = [create_agent(agent_type, self.next_id(), self) for _ in range(count)]
+        for agent, x, y in zip(agents, xs.tolist(), ys.tolist()):
+            self.grid.place_agent(agent, (x, y))
+            self.schedule.add(agent)
+        return agents
+
+    def place_agent(self, agent, max_attempts=1000):
+        """Place an agent on a free walkable cell.
+
+        Chunked worlds have no free-cell index and sample random cells instead,
+        giving up after max_attempts. Raises ValueError if no cell is found.
+        """
+        free_cells = self.get_free_cells()
+        if free_cells is not None:
+            self.grid.place_agent(agent, free_cells.take(self.random))
+            return True
+        for _ in range(max_attempts):
+            x = self.random.randrange(self.width)
+            y = self.random.randrange(self.height)
+            if self.is_valid_move(x, y) and self.grid.is_cell_empty((x, y)):
+                self.grid.place_agent(agent, (x, y))
+                return True
+        raise ValueError(f"Could not find a free walkable cell after {max_attempts} attempts")
+
+    def step(self):
+        self.timers.advance()  # Fire cooldown, status-effect and damage-over-time events due this tick
+        self.perception.rebuild(self.schedule.agents)
+        self.decisions.decide(self.schedule.agents)  # Choose every enemy's and neutral's action in one batch
+        self.schedule.step()
+        self.update_environment()
+        self.award_experience()
+        if self.recorder is not None:
+            self.recorder.end_tick()
+
+    def update_environment(self):
+        """Update environmental effects and world state.
+
+        This is the only place terrain affects agents: once per tick, based on
+        where each agent stands after every agent has acted.
+        """
+        self.apply_environmental_effects(self.schedule.agents)
+
+    def award_experience(self):
+        """Hands out the experience earned by kills this tick, levelling up agents in one batch."""
+        awards = [(agent, amount) for agent, amount in self.experience_awards if agent.pos is not None]
+        self.experience_awards = []
+        if awards:
+            ProgressionManager.award_experience(*zip(*awards))
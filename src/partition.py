@@ -0,0 +1,381 @@
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+import numpy as np
+from src.agent_types import AgentType
+from src.combat_system import CombatSystem, AttackType, CRITICAL_MULTIPLIER
+from src.terrain import TerrainType, LAVA_DAMAGE
+from src.world_layers import WorldLayers
+
+# One row per agent. Two copies live in shared memory: the snapshot every
+# worker reads during a tick and the buffer owners write the next tick into.
+AGENT_DTYPE = np.dtype([
+    ("id", np.int64),
+    ("kind", np.int8),
+    ("alive", np.bool_),
+    ("x", np.int32),
+    ("y", np.int32),
+    ("health", np.float64),
+    ("stamina", np.float64),
+    ("max_stamina", np.float64),
+    ("strength", np.float64),
+    ("dexterity", np.float64),
+    ("endurance", np.float64),
+    ("weapon_damage", np.float64),
+    ("attack_cost", np.float64),
+    ("defense", np.float64),
+    ("detection_range", np.int32),
+])
+
+PLAYER = AgentType.PLAYER.value
+ENEMY = AgentType.ENEMY.value
+NEUTRAL = AgentType.NEUTRAL.value
+
+DAMAGE_SCALE = 1000  # Damage is summed in fixed point so totals do not depend on the partition
+
+MOORE = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+VON_NEUMANN = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+# Salts separating the random draws one agent makes in one tick
+SALT_TARGET, SALT_MOVE, SALT_DODGE, SALT_CRIT = 1, 2, 3, 4
+
+_MASK = (1 << 64) - 1
+
+def agent_uniform(seed, tick, agent_id, salt):
+    """Counter-based random number in [0, 1) for one decision of one agent.
+
+    The value depends only on its arguments, never on which process draws it
+    or in what order, which is what makes partitioned runs reproducible.
+    """
+    z = (seed * 0x9E3779B97F4A7C15 + tick * 0xD1B54A32D192ED03
+         + agent_id * 0xBF58476D1CE4E5B9 + salt * 0x94D049BB133111EB) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    z ^= z >> 31
+    return (z >> 11) / 9007199254740992.0
+
+def agent_table(model):
+    """Extracts the agents of a SoulslikeModel into an AGENT_DTYPE array, ordered by unique_id."""
+    agents = sorted((a for a in model.schedule.agents if a.pos is not None), key=lambda a: a.unique_id)
+    table = np.zeros(len(agents), dtype=AGENT_DTYPE)
+    for row, agent in zip(table, agents):
+        weapon = agent.equipment.get_equipped_weapon()
+        row["id"] = agent.unique_id
+        row["kind"] = agent.agent_type.value
+        row["alive"] = True
+        row["x"], row["y"] = agent.pos
+        row["health"] = agent.health
+        row["stamina"] = agent.stamina
+        row["max_stamina"] = agent.max_stamina
+        row["strength"] = agent.strength
+        row["dexterity"] = agent.dexterity
+        row["endurance"] = agent.endurance
+        row["weapon_damage"] = agent.strength if weapon is None else weapon.damage
+        row["attack_cost"] = CombatSystem.get_stamina_cost(agent, AttackType.LIGHT)
+        row["defense"] = agent.equipment.get_total_defense()
+        row["detection_range"] = agent.detection_range
+    return table
+
+def split_regions(width, height, columns, rows):
+    """Splits the map into columns x rows rectangles (x0, y0, x1, y1), half-open."""
+    xs = np.linspace(0, width, columns + 1).astype(int)
+    ys = np.linspace(0, height, rows + 1).astype(int)
+    return [(int(xs[i]), int(ys[j]), int(xs[i + 1]), int(ys[j + 1]))
+            for j in range(rows) for i in range(columns)]
+
+def region_slots(state, region, margin=0):
+    """Returns the slots of living agents inside a region grown by margin cells."""
+    x0, y0, x1, y1 = region
+    mask = (state["alive"] & (state["x"] >= x0 - margin) & (state["x"] < x1 + margin)
+            & (state["y"] >= y0 - margin) & (state["y"] < y1 + margin))
+    return np.flatnonzero(mask)
+
+def decide_region(state, out, damage_row, walkable, region, halo, tick, seed):
+    """Phase one of a tick: owned agents act on the snapshot.
+
+    Agents owned by the region (inside it in `state`) regenerate stamina, pick
+    an action from what they can see in the region plus its halo, write their
+    new position and stamina to `out`, and add the damage they deal to
+    `damage_row`, whoever owns the target.
+    """
+    width, height = walkable.shape
+    visible = region_slots(state, region, halo)
+    cells = {}
+    players = {}  # Players bucketed by (x // halo, y // halo), so every detection range spans 3x3 buckets
+    for slot, x, y, kind in zip(visible.tolist(), state["x"][visible].tolist(),
+                                state["y"][visible].tolist(), state["kind"][visible].tolist()):
+        if kind == ENEMY:
+            cells.setdefault((x, y), []).append(slot)
+        elif kind == PLAYER:
+            players.setdefault((x // halo, y // halo), []).append((slot, x, y))
+
+    def can_enter(x, y):
+        return 0 <= x < width and 0 <= y < height and walkable[x, y]
+
+    owned = region_slots(state, region)
+    rows = state[owned]
+    new_x, new_y = rows["x"].copy(), rows["y"].copy()
+    stamina = np.minimum(rows["max_stamina"], rows["stamina"] + CombatSystem.stamina_regen_rate(rows["endurance"]))
+    targets, amounts = [], []
+    for i, (agent_id, x, y, kind, detection_range) in enumerate(zip(
+            rows["id"].tolist(), rows["x"].tolist(), rows["y"].tolist(), rows["kind"].tolist(),
+            rows["detection_range"].tolist())):
+        target = None
+        step = None
+
+        if kind == PLAYER:
+            adjacent = [s for dx, dy in MOORE for s in cells.get((x + dx, y + dy), ())]
+            if adjacent:
+                adjacent.sort()
+                target = adjacent[int(agent_uniform(seed, tick, agent_id, SALT_TARGET) * len(adjacent))]
+            else:
+                step = MOORE[int(agent_uniform(seed, tick, agent_id, SALT_MOVE) * len(MOORE))]
+        elif kind == ENEMY:
+            # Nearest player within detection range, lowest slot on ties
+            nearest = None
+            bx, by = x // halo, y // halo
+            for cx in range(bx - 1, bx + 2):
+                for cy in range(by - 1, by + 2):
+                    for s, px, py in players.get((cx, cy), ()):
+                        d = abs(px - x) + abs(py - y)
+                        if d <= detection_range and (nearest is None or (d, s) < nearest[:2]):
+                            nearest = (d, s, px, py)
+            if nearest is not None and nearest[0] <= 1:
+                target = nearest[1]
+            elif nearest is not None:
+                _, _, px, py = nearest
+                dx, dy = (px > x) - (px < x), (py > y) - (py < y)
+                options = [(dx, 0), (0, dy)] if abs(px - x) >= abs(py - y) else [(0, dy), (dx, 0)]
+                step = next((o for o in options if o != (0, 0) and can_enter(x + o[0], y + o[1])), None)
+            else:
+                step = VON_NEUMANN[int(agent_uniform(seed, tick, agent_id, SALT_MOVE) * len(VON_NEUMANN))]
+        else:
+            step = VON_NEUMANN[int(agent_uniform(seed, tick, agent_id, SALT_MOVE) * len(VON_NEUMANN))]
+
+        row = rows[i]
+        if target is not None and stamina[i] >= row["attack_cost"]:
+            stamina[i] -= row["attack_cost"]
+            defender = state[target]
+            if agent_uniform(seed, tick, agent_id, SALT_DODGE) >= CombatSystem.dodge_chance(defender["dexterity"]):
+                damage = CombatSystem.attack_damage(row["weapon_damage"], row["strength"], row["dexterity"],
+                                                    AttackType.LIGHT)
+                if agent_uniform(seed, tick, agent_id, SALT_CRIT) < CombatSystem.critical_chance(row["dexterity"]):
+                    damage *= CRITICAL_MULTIPLIER
+                damage = max(1, damage - defender["defense"])  # CombatSystem.calculate_damage
+                damage = max(1, damage - defender["defense"])  # SoulslikeAgent.take_damage
+                targets.append(target)
+                amounts.append(int(round(damage * DAMAGE_SCALE)))
+        elif step is not None and can_enter(x + step[0], y + step[1]):
+            new_x[i], new_y[i] = x + step[0], y + step[1]
+
+    out[owned] = rows
+    out["x"][owned], out["y"][owned] = new_x, new_y
+    out["stamina"][owned] = stamina
+    if targets:
+        np.add.at(damage_row, targets, amounts)
+
+def apply_region(state, out, damage, terrain, region):
+    """Phase two of a tick: owners apply the damage summed over all workers.
+
+    Lava damages agents that ended the tick on it. Agents that die are marked
+    dead in both buffers. Returns how many agents left the region this tick.
+    """
+    owned = region_slots(state, region)
+    if not len(owned):
+        return 0
+    hits = damage[:, owned].sum(axis=0)
+    damage[:, owned] = 0
+    health = out["health"][owned] - hits / DAMAGE_SCALE
+    on_lava = terrain[out["x"][owned], out["y"][owned]] == TerrainType.LAVA.value
+    health[on_lava] -= np.maximum(1, LAVA_DAMAGE - out["defense"][owned][on_lava])
+    out["health"][owned] = health
+    dead = owned[health <= 0]
+    # Dead rows are never written again, so both buffers get the same final
+    # row. It keeps the cell the agent died from: other workers read region
+    # membership from state's x and y during this phase.
+    out["alive"][dead] = False
+    out["x"][dead], out["y"][dead] = state["x"][dead], state["y"][dead]
+    state[dead] = out[dead]
+    x0, y0, x1, y1 = region
+    nx, ny = out["x"][owned], out["y"][owned]
+    left = ~((nx >= x0) & (nx < x1) & (ny >= y0) & (ny < y1)) & out["alive"][owned]
+    return int(left.sum())
+
+def run_worker(index, workers, regions, names, count, layers_handle, halo, first_tick, ticks, seed,
+               barrier, results):
+    """Process entry point: simulates every workers-th region for a number of ticks."""
+    agent_memory = shared_memory.SharedMemory(name=names[0])
+    damage_memory = shared_memory.SharedMemory(name=names[1])
+    layers = WorldLayers.attach(layers_handle)
+    try:
+        buffers = np.ndarray((2, count), dtype=AGENT_DTYPE, buffer=agent_memory.buf)
+        damage = np.ndarray((workers, count), dtype=np.int64, buffer=damage_memory.buf)
+        mine = regions[index::workers]
+        migrations = 0
+        for t in range(ticks):
+            state, out = buffers[t % 2], buffers[(t + 1) % 2]
+            for region in mine:
+                decide_region(state, out, damage[index], layers.walkable, region, halo, first_tick + t + 1, seed)
+            barrier.wait()  # Every worker's moves and damage are written
+            for region in mine:
+                migrations += apply_region(state, out, damage, layers.terrain, region)
+            barrier.wait()  # The next snapshot is complete
+        results.put((index, migrations))
+    finally:
+        del buffers, damage
+        agent_memory.close()
+        damage_memory.close()
+        layers.close()
+
+class PartitionedSimulation:
+    """Runs a reduced, synchronous version of the model split into rectangular regions.
+
+    Each region is simulated by a worker process. Every tick has two phases
+    separated by barriers: owners read a snapshot of all agents (their own plus
+    the halo of ghost agents within `halo` cells of the region) and decide
+    moves and attacks, then owners apply the damage every worker dealt to their
+    agents. Agents migrate when they end a tick in another region.
+
+    Rules: players attack a random adjacent enemy (Moore neighbourhood) or
+    step in a random direction; enemies attack the nearest player at Manhattan
+    distance 1, chase it within detection range, or patrol; neutrals patrol.
+    Attacks are light attacks resolved with the CombatSystem formulas, and lava
+    damages agents that end a tick on it.
+
+    Dropped from SoulslikeModel: heavy and skill attacks, all skills (fireball,
+    healing, quick_step) with their cooldowns and mana, status effects
+    (poison, burning, staggered, ...), poise damage and stagger, the
+    DecisionEngine's weighted choices including fleeing and neutral healing,
+    player self-healing, health regeneration, experience and levelling.
+    Agents step by writing their new cell directly rather than through
+    agent.move and grid.move_agent, and enemies chase with a greedy
+    axis-aligned step instead of World.get_path.
+
+    Reproducibility: every random draw comes from agent_uniform(seed, tick,
+    agent id, salt) and all decisions read the same snapshot, so the final
+    state is identical for any region grid and any number of workers,
+    including run(ticks, workers=0), which steps the same regions serially in
+    this process.
+
+    It is not SoulslikeModel split into regions: the model's agents act
+    sequentially in random order and draw from the model's generators. The
+    two agree tick for tick only where the rules above leave no choice, e.g.
+    enemies that can afford nothing but a light attack, no dodges or critical
+    hits, straight-line chases and no deaths; tests/test_partition.py runs
+    both on such a setup. to_model() writes the result back into a model.
+    """
+    def __init__(self, state, layers, regions=(2, 2), seed=0):
+        self.state = state.copy()
+        self.layers = layers
+        self.width, self.height = layers.width, layers.height
+        self.regions = split_regions(self.width, self.height, *regions)
+        self.seed = seed
+        self.tick = 0
+        self.halo = max(1, int(state["detection_range"].max())) if len(state) else 1
+
+    @classmethod
+    def from_model(cls, model, regions=(2, 2), seed=0):
+        """Builds a partitioned simulation from the current state of a SoulslikeModel."""
+        layers = model.layers if model.layers is not None else WorldLayers.from_world(model)
+        return cls(agent_table(model), layers, regions, seed)
+
+    def to_model(self, model):
+        """Writes positions, health, stamina and deaths back into the model the state came from.
+
+        Agents are matched by unique_id. Moves go through grid.move_agent, so
+        the model's free-cell index stays in sync, and agents that died are
+        removed with die(). The model's clock is not advanced.
+        """
+        agents = {agent.unique_id: agent for agent in model.schedule.agents if agent.pos is not None}
+        for row in self.state:
+            agent = agents.get(int(row["id"]))
+            if agent is None:
+                continue
+            agent.health = float(row["health"])
+            if not row["alive"]:
+                agent.die()
+                continue
+            agent.stamina = float(row["stamina"])
+            pos = (int(row["x"]), int(row["y"]))
+            if pos != agent.pos:
+                model.grid.move_agent(agent, pos)
+
+    def run(self, ticks, workers=None):
+        """Advances the simulation and returns the number of region migrations.
+
+        workers=None uses one process per region (capped at the CPU count);
+        workers=0 runs serially in this process.
+        """
+        if workers is None:
+            workers = min(len(self.regions), multiprocessing.cpu_count())
+        if workers == 0:
+            return self.run_serial(ticks)
+
+        count = len(self.state)
+        shared_here = self.layers.memory is None
+        layers_handle = self.layers.share()  # Workers attach to the map instead of receiving a copy
+        agent_memory = shared_memory.SharedMemory(create=True, size=max(1, 2 * count * AGENT_DTYPE.itemsize))
+        damage_memory = shared_memory.SharedMemory(create=True, size=max(1, workers * count * 8))
+        try:
+            buffers = np.ndarray((2, count), dtype=AGENT_DTYPE, buffer=agent_memory.buf)
+            buffers[:] = self.state
+            damage = np.ndarray((workers, count), dtype=np.int64, buffer=damage_memory.buf)
+            damage[:] = 0
+            barrier = multiprocessing.Barrier(workers)
+            results = multiprocessing.Queue()
+            processes = [
+                multiprocessing.Process(target=run_worker, args=(
+                    index, workers, self.regions, (agent_memory.name, damage_memory.name), count,
+                    layers_handle, self.halo, self.tick, ticks, self.seed, barrier, results))
+                for index in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            try:
+                migrations = sum(self.collect(results, processes))
+            finally:
+                for process in processes:
+                    if process.is_alive() and process.exitcode is None:
+                        process.join(timeout=1)
+                    if process.is_alive():
+                        process.terminate()
+            self.state = buffers[ticks % 2].copy()
+            self.tick += ticks
+            del buffers, damage
+            return migrations
+        finally:
+            agent_memory.close()
+            agent_memory.unlink()
+            damage_memory.close()
+            damage_memory.unlink()
+            if shared_here:
+                self.layers.close()
+
+    @staticmethod
+    def collect(results, processes):
+        """Yields each worker's migration count, failing fast if a worker dies."""
+        for _ in processes:
+            while True:
+                try:
+                    yield results.get(timeout=1)[1]
+                    break
+                except queue.Empty:
+                    failed = [p for p in processes if p.exitcode not in (None, 0)]
+                    if failed:
+                        raise RuntimeError(f"Partition worker exited with code {failed[0].exitcode}")
+
+    def run_serial(self, ticks):
+        """Advances the simulation in this process with the same two-phase ticks."""
+        buffers = np.stack([self.state, self.state])
+        damage = np.zeros((1, len(self.state)), dtype=np.int64)
+        migrations = 0
+        for t in range(ticks):
+            state, out = buffers[t % 2], buffers[(t + 1) % 2]
+            for region in self.regions:
+                decide_region(state, out, damage[0], self.layers.walkable, region, self.halo, self.tick + t + 1,
+                              self.seed)
+            for region in self.regions:
+                migrations += apply_region(state, out, damage, self.layers.terrain, region)
+        self.state = buffers[ticks % 2].copy()
+        self.tick += ticks
+        return migrations
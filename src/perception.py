@@ -0,0 +1,81 @@
+from src.agents import AgentType
+
+class Perception:
+    """Who-is-adjacent and who-is-in-range relations, rebuilt once per tick.
+
+    rebuild() makes one sweep over agent positions, bucketing agents by cell
+    for adjacency and players into a coarse hash grid for detection-range
+    queries. Agents read these relations during their step instead of issuing
+    their own MultiGrid queries. The relations are a snapshot of the start of
+    the tick: callers re-check live positions before acting on them.
+    """
+    def __init__(self, world):
+        self.world = world
+        self.cells = {}
+        self.adjacent = {}
+        self.nearest = {}
+
+    def rebuild(self, agents):
+        """Recomputes all relations from the current agent positions."""
+        grid = self.world.grid
+        cells = {}
+        players = []
+        for order, agent in enumerate(agents):
+            if agent.pos is None:
+                continue
+            cells.setdefault(agent.pos, []).append(agent)
+            if agent.agent_type == AgentType.PLAYER:
+                players.append((order, agent))
+
+        # Agents sharing a cell share one neighbour list (same as get_neighbors with radius 1)
+        adjacent = {}
+        for pos, occupants in cells.items():
+            neighbours = [a for p in grid.get_neighborhood(pos, moore=True, include_center=False)
+                          for a in cells.get(p, ())]
+            for agent in occupants:
+                adjacent[agent] = neighbours
+
+        # Nearest player within detection range, ties going to the earlier scheduled player
+        nearest = {}
+        if players:
+            bucket = max(1, max(a.detection_range for occupants in cells.values() for a in occupants))
+            buckets = {}
+            for order, player in players:
+                buckets.setdefault((player.pos[0] // bucket, player.pos[1] // bucket), []).append((order, player))
+            for pos, occupants in cells.items():
+                for agent in occupants:
+                    if agent.agent_type == AgentType.PLAYER:
+                        continue
+                    reach = agent.detection_range
+                    rings = -(-reach // bucket)
+                    bx, by = pos[0] // bucket, pos[1] // bucket
+                    best = None
+                    for i in range(bx - rings, bx + rings + 1):
+                        for j in range(by - rings, by + rings + 1):
+                            for order, player in buckets.get((i, j), ()):
+                                distance = abs(pos[0] - player.pos[0]) + abs(pos[1] - player.pos[1])
+                                if distance <= reach and (best is None or (distance, order) < best[:2]):
+                                    best = (distance, order, player)
+                    if best is not None:
+                        nearest[agent] = best[2]
+
+        self.cells = cells
+        self.adjacent = adjacent
+        self.nearest = nearest
+
+    def adjacent_agents(self, agent):
+        """Agents in the Moore neighbourhood of the agent at the start of the tick."""
+        return self.adjacent.get(agent, [])
+
+    def nearest_player(self, agent):
+        """The nearest living player within the agent's detection range, or None."""
+        player = self.nearest.get(agent)
+        if player is None or player.pos is None:
+            return None
+        return player
+
+    def is_adjacent(self, agent, other):
+        """Checks whether two agents are currently in each other's Moore neighbourhood."""
+        if agent.pos is None or other.pos is None or agent.pos == other.pos:
+            return False
+        return other.pos in self.world.grid.get_neighborhood(agent.pos, moore=True, include_center=False)
@@ -1,3 +1,5 @@
+import numpy as np
+
 class Skill:
     def __init__(self, name, description, requirements):
         self.name = name
@@ -11,25 +13,125 @@ class SkillTree:
     def add_skill(self, skill):
         self.skills[skill.name] = skill
 
+MAX_LEVEL = 100
+XP_PER_LEVEL = 100  # Going from level L to L + 1 takes L * XP_PER_LEVEL experience
+BASE_ATTRIBUTE = 10
+ATTRIBUTES = ("strength", "dexterity", "vitality", "endurance")
+KILL_EXPERIENCE = 50  # Experience per level of the defeated agent
+
+def derived_stats(strength, vitality, endurance):
+    """Returns (max_health, max_stamina, max_poise) for the given attributes. Works on scalars and arrays."""
+    return 100 + (vitality * 10), 100 + (endurance * 5), 50 + (vitality * 2) + (strength * 1)
+
+def build_level_table(max_level=MAX_LEVEL):
+    """Per-level XP thresholds and stats of an agent that started at level 1 with base attributes.
+
+    Indexed by level; row 0 is unused. Every level adds one point to each
+    attribute. Agents start with 100 health and stamina and 50 poise, and
+    derived maxima are recomputed from their attributes from level 2 on.
+    """
+    levels = np.arange(max_level + 1)
+    table = np.zeros(max_level + 1, dtype=[
+        ("xp_to_reach", np.int64), ("xp_to_next", np.int64), ("strength", np.int32), ("dexterity", np.int32),
+        ("vitality", np.int32), ("endurance", np.int32), ("max_health", np.float64),
+        ("max_stamina", np.float64), ("max_poise", np.float64)])
+    table["xp_to_next"] = levels * XP_PER_LEVEL
+    table["xp_to_reach"][1:] = np.concatenate([[0], np.cumsum(table["xp_to_next"][1:-1])])
+    for name in ATTRIBUTES:
+        table[name] = BASE_ATTRIBUTE + np.maximum(levels - 1, 0)
+    table["max_health"], table["max_stamina"], table["max_poise"] = derived_stats(
+        table["strength"], table["vitality"], table["endurance"])
+    table["max_health"][:2], table["max_stamina"][:2], table["max_poise"][:2] = 100.0, 100.0, 50.0
+    return table
+
+_level_table = None
+
+def get_level_table():
+    """Returns the level table for MAX_LEVEL, building it on first use."""
+    global _level_table
+    if _level_table is None:
+        _level_table = build_level_table()
+    return _level_table
+
+def __getattr__(name):
+    # LEVEL_TABLE stays importable as a module attribute but is only built when first accessed
+    if name == "LEVEL_TABLE":
+        return get_level_table()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 class ProgressionManager:
     @staticmethod
     def gain_experience(agent, amount):
-        """Adds experience points to the agent."""
-        agent.experience += amount
-        if ProgressionManager.check_level_up(agent):
-            ProgressionManager.level_up(agent)
+        """Adds experience points to the agent, levelling up as many times as they cover."""
+        ProgressionManager.award_experience([agent], [amount])
 
     @staticmethod
     def check_level_up(agent):
         """Checks if the agent has enough XP to level up."""
-        return agent.experience >= agent.level * 100
+        return agent.level < MAX_LEVEL and agent.experience >= get_level_table()["xp_to_next"][agent.level]
 
     @staticmethod
     def level_up(agent):
-        """Increases the agent's level and allows attribute allocation."""
-        agent.level += 1
-        agent.experience -= (agent.level - 1) * 100
-        # Implement attribute allocation logic here
+        """Increases the agent's level by one without spending experience."""
+        ProgressionManager.set_levels([agent], [agent.level + 1])
+
+    @staticmethod
+    def award_experience(agents, amounts):
+        """Adds experience to many agents at once and returns the agents whose level changed.
+
+        Each agent's experience counts towards its next level. The new level is
+        looked up in the XP thresholds of the level table, so an award crossing
+        several levels is resolved in one step. An agent may appear more than
+        once; its awards are added up.
+        """
+        totals = {}
+        for agent, amount in zip(agents, amounts):
+            totals[agent] = totals.get(agent, 0) + amount
+        if not totals:
+            return []
+        agents = list(totals)
+        levels = np.array([agent.level for agent in agents])
+        xp_to_reach = get_level_table()["xp_to_reach"]
+        total = xp_to_reach[levels] + np.array([agent.experience for agent in agents]) + np.array(list(totals.values()))
+        new_levels = np.minimum(np.searchsorted(xp_to_reach, total, side="right") - 1, MAX_LEVEL)
+        new_levels = np.maximum(new_levels, levels)  # Experience is never taken away
+        for agent, experience in zip(agents, (total - xp_to_reach[new_levels]).tolist()):
+            agent.experience = experience
+        changed = np.flatnonzero(new_levels != levels)
+        levelled = [agents[i] for i in changed.tolist()]
+        ProgressionManager.set_levels(levelled, new_levels[changed])
+        return levelled
+
+    @staticmethod
+    def set_levels(agents, levels):
+        """Moves agents to new levels, adding one point per level gained to each attribute.
+
+        Derived maxima are recomputed only for these agents, in one batch.
+        """
+        if not len(agents):
+            return
+        levels = np.asarray(levels)
+        if levels.max() > MAX_LEVEL:
+            raise ValueError(f"Level cannot exceed {MAX_LEVEL}")
+        gained = levels - np.array([agent.level for agent in agents])
+        attributes = {}
+        for name in ATTRIBUTES:
+            attributes[name] = np.array([getattr(agent, name) for agent in agents]) + gained
+        max_health, max_stamina, max_poise = derived_stats(
+            attributes["strength"], attributes["vitality"], attributes["endurance"])
+        for i, agent in enumerate(agents):
+            agent.level = int(levels[i])
+            for name in ATTRIBUTES:
+                setattr(agent, name, int(attributes[name][i]))
+            agent.max_health = float(max_health[i])
+            agent.max_stamina = float(max_stamina[i])
+            agent.max_poise = float(max_poise[i])
+
+    @staticmethod
+    def credit_kill(killer, victim):
+        """Queues kill experience for the killer if the victim just died; it is awarded at the end of the tick."""
+        if victim.pos is None and killer.pos is not None:
+            killer.model.experience_awards.append((killer, KILL_EXPERIENCE * victim.level))
 
     @staticmethod
     def allocate_attribute_point(agent, attribute):
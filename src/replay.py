@@ -0,0 +1,280 @@
+from collections import namedtuple
+import json
+import random
+import numpy as np
+from src.agent_types import AgentType, StatusEffect
+from src.terrain import TerrainType, ObstacleType
+from src.world_layers import WorldLayers, LayerCells, NO_OBSTACLE
+
+# One agent's recorded state; status is a bitmask of StatusEffect values
+ROW_DTYPE = np.dtype([("id", np.int32), ("kind", np.int8), ("x", np.int32), ("y", np.int32),
+                      ("health", np.float32), ("max_health", np.float32), ("status", np.uint8)])
+
+# A cell of a chunked world that no longer matches what its chunk's seed generates
+CELL_DTYPE = np.dtype([("x", np.int32), ("y", np.int32), ("terrain", np.int8), ("obstacle", np.int8)])
+
+# Events that a state diff cannot show; value is the attack type or skill id
+EVENT_DTYPE = np.dtype([("tick", np.int32), ("kind", np.int8), ("agent", np.int32), ("other", np.int32),
+                        ("value", np.int16), ("amount", np.float32)])
+ATTACK, SKILL, DAMAGE = 0, 1, 2
+NO_AGENT = -1
+
+AGENT_TYPES = list(AgentType)
+STATUS_EFFECTS = list(StatusEffect)
+
+ReplayAgent = namedtuple("ReplayAgent", ["unique_id", "agent_type", "pos", "health", "max_health",
+                                         "status_effects"])
+ReplayGrid = namedtuple("ReplayGrid", ["width", "height"])
+ReplaySchedule = namedtuple("ReplaySchedule", ["agents"])
+
+def status_mask(status_effects):
+    """Packs a collection of StatusEffects into a bitmask."""
+    mask = 0
+    for effect in status_effects:
+        mask |= 1 << effect.value
+    return mask
+
+def changed_chunk_cells(cells):
+    """Every cell of the chunks of a ChunkedCells that were modified since generation, as CELL_DTYPE rows."""
+    rows = []
+    for cx, cy in sorted(cells.dirty | cells.spilled):
+        for column in cells.get_chunk(cx, cy):
+            rows.extend((cell.x, cell.y, cell.terrain_type.value,
+                         NO_OBSTACLE if cell.obstacle is None else cell.obstacle.value) for cell in column)
+    return np.array(rows, dtype=CELL_DTYPE)
+
+def merge_rows(state, rows, removed):
+    """Returns state (sorted by id) with `removed` ids dropped and `rows` inserted or replaced."""
+    drop = np.isin(state["id"], removed) | np.isin(state["id"], rows["id"])
+    merged = np.concatenate([state[~drop], rows])
+    return merged[np.argsort(merged["id"], kind="stable")]
+
+class ReplayRecorder:
+    """Records a running SoulslikeModel as keyframes plus per-tick deltas.
+
+    Attaching the recorder stores the model's RNG states, the map and an
+    initial keyframe. Chunked worlds are stored as their world seed plus the
+    cells of chunks changed so far, since snapshotting the map would generate
+    every chunk. After every tick the model calls end_tick(), which compares the
+    agents' positions, health and status effects with the previous tick and
+    keeps only the rows that changed and the ids of agents that died; every
+    keyframe_interval ticks a full snapshot is kept as well so playback can
+    seek without replaying from the start. Attacks, skill uses and damage are
+    recorded as events by the agents as they happen.
+    """
+    def __init__(self, model, keyframe_interval=50):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.model = model
+        self.keyframe_interval = keyframe_interval
+        self.rng_states = json.dumps({
+            "model_seed": model._seed,
+            "model_random": model.random.getstate()[1],
+            "random": random.getstate()[1],
+            "numpy": np.random.get_state()[1].tolist(),
+            "decisions": model.decisions.rng.bit_generator.state if hasattr(model, "decisions") else None,
+        })
+        self.layers = self.chunked_world = None
+        if model.layers is not None:
+            self.layers = model.layers
+        elif model.chunk_size:
+            self.chunked_world = json.dumps({
+                "width": model.width,
+                "height": model.height,
+                "chunk_size": model.chunk_size,
+                "world_seed": model.world_seed,
+                "max_chunks": model.cells.max_chunks,
+            })
+            self.chunk_cells = changed_chunk_cells(model.cells)
+        else:
+            self.layers = WorldLayers.from_world(model)
+        self.start_tick = model.timers.now
+        self.previous = self.snapshot()
+        self.keyframes = {self.start_tick: self.previous}
+        self.deltas = []  # (changed rows, ids of agents that died) per tick after start_tick
+        self.events = []
+        model.recorder = self
+
+    def snapshot(self):
+        """Current state of every placed agent as ROW_DTYPE rows sorted by id."""
+        rows = np.array([(a.unique_id, a.agent_type.value, a.pos[0], a.pos[1], a.health, a.max_health,
+                          status_mask(a.status_effects) if a.status_effects else 0)
+                         for a in self.model.schedule.agents if a.pos is not None], dtype=ROW_DTYPE)
+        return rows[np.argsort(rows["id"], kind="stable")]
+
+    def end_tick(self):
+        """Records the changes made during the tick that just ran."""
+        current = self.snapshot()
+        previous = self.previous
+        died = previous["id"][~np.isin(previous["id"], current["id"], assume_unique=True)]
+        # Rows of agents that are new or differ from their previous row
+        index = np.searchsorted(previous["id"], current["id"])
+        index = np.minimum(index, max(len(previous) - 1, 0))
+        same = np.zeros(len(current), dtype=np.bool_)
+        if len(previous):
+            same = previous[index] == current
+        self.deltas.append((current[~same], died))
+        tick = self.model.timers.now
+        if (tick - self.start_tick) % self.keyframe_interval == 0:
+            self.keyframes[tick] = current
+        self.previous = current
+
+    def record(self, kind, agent, other=None, value=0, amount=0.0):
+        """Appends an event for the current tick."""
+        self.events.append((self.model.timers.now, kind, agent.unique_id,
+                            NO_AGENT if other is None else other.unique_id, value, amount))
+
+    def record_attack(self, attacker, target, attack_type):
+        self.record(ATTACK, attacker, target, attack_type.value)
+
+    def record_skill(self, agent, skill, target):
+        self.record(SKILL, agent, target, skill.skill_id)
+
+    def record_damage(self, agent, amount):
+        self.record(DAMAGE, agent, amount=amount)
+
+    def detach(self):
+        """Stops recording."""
+        if self.model.recorder is self:
+            self.model.recorder = None
+
+    def arrays(self):
+        """The recording as a dict of numpy arrays, the format save() writes."""
+        keyframe_ticks = sorted(self.keyframes)
+        keyframes = [self.keyframes[tick] for tick in keyframe_ticks]
+        rows = [delta[0] for delta in self.deltas]
+        died = [delta[1] for delta in self.deltas]
+        if self.layers is not None:
+            world = {"layers": np.asarray(self.layers.data)}
+        else:
+            world = {"chunked_world": np.array(self.chunked_world), "chunk_cells": self.chunk_cells}
+        return {
+            **world,
+            "rng_states": np.array(self.rng_states),
+            "start_tick": np.array(self.start_tick),
+            "keyframe_ticks": np.array(keyframe_ticks, dtype=np.int64),
+            "keyframe_offsets": np.cumsum([0] + [len(k) for k in keyframes]),
+            "keyframe_rows": np.concatenate(keyframes),
+            "delta_offsets": np.cumsum([0] + [len(r) for r in rows]),
+            "delta_rows": np.concatenate(rows) if rows else np.empty(0, dtype=ROW_DTYPE),
+            "death_offsets": np.cumsum([0] + [len(d) for d in died]),
+            "deaths": np.concatenate(died) if died else np.empty(0, dtype=np.int32),
+            "events": np.array(self.events, dtype=EVENT_DTYPE),
+        }
+
+    def save(self, path):
+        """Writes the recording to a compressed .npz file that Replay.load() reads."""
+        np.savez_compressed(path, **self.arrays())
+
+    def replay(self):
+        """Returns a Replay of what has been recorded so far without going through a file."""
+        return Replay(self.arrays())
+
+class Replay:
+    """Playback of a recording made by ReplayRecorder.
+
+    state_at() rebuilds the agents' state at any recorded tick from the
+    nearest earlier keyframe, and view() returns a model-like object that
+    SoulslikeUI can draw and step through.
+    """
+    def __init__(self, arrays):
+        self.arrays = arrays
+        if "layers" in arrays:
+            self.layers, self.chunked_world = WorldLayers(arrays["layers"]), None
+            self.width, self.height = self.layers.width, self.layers.height
+        else:
+            self.layers, self.chunked_world = None, json.loads(str(arrays["chunked_world"]))
+            self.width, self.height = self.chunked_world["width"], self.chunked_world["height"]
+        self.rng_states = json.loads(str(arrays["rng_states"]))
+        self.first_tick = int(arrays["start_tick"])
+        self.last_tick = self.first_tick + len(arrays["delta_offsets"]) - 1
+        self.keyframe_ticks = arrays["keyframe_ticks"]
+        events = arrays["events"]
+        self.events = events
+        self.event_offsets = np.searchsorted(events["tick"], np.arange(self.first_tick, self.last_tick + 2))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def check_tick(self, tick):
+        if not self.first_tick <= tick <= self.last_tick:
+            raise ValueError(f"Tick {tick} is outside the recording ({self.first_tick}-{self.last_tick})")
+
+    def keyframe(self, index):
+        offsets = self.arrays["keyframe_offsets"]
+        return self.arrays["keyframe_rows"][offsets[index]:offsets[index + 1]]
+
+    def delta(self, tick):
+        """Rows changed and ids removed during `tick`."""
+        i = tick - self.first_tick - 1
+        rows = self.arrays["delta_rows"][self.arrays["delta_offsets"][i]:self.arrays["delta_offsets"][i + 1]]
+        died = self.arrays["deaths"][self.arrays["death_offsets"][i]:self.arrays["death_offsets"][i + 1]]
+        return rows, died
+
+    def advance(self, state, tick):
+        """Applies the delta of `tick` to the state at the tick before."""
+        rows, died = self.delta(tick)
+        return merge_rows(state, rows, died)
+
+    def state_at(self, tick):
+        """ROW_DTYPE rows of the agents alive at the end of `tick`, sorted by id."""
+        self.check_tick(tick)
+        index = np.searchsorted(self.keyframe_ticks, tick, side="right") - 1
+        state = self.keyframe(index)
+        for t in range(int(self.keyframe_ticks[index]) + 1, tick + 1):
+            state = self.advance(state, t)
+        return state
+
+    def events_at(self, tick):
+        """EVENT_DTYPE rows recorded during `tick`."""
+        self.check_tick(tick)
+        i = tick - self.first_tick
+        return self.events[self.event_offsets[i]:self.event_offsets[i + 1]]
+
+    def world_cells(self):
+        """cells[x][y] of the recorded map, regenerating chunked worlds from their seed."""
+        if self.layers is not None:
+            return LayerCells(self.layers)
+        from src.world_chunks import ChunkedCells  # Lazy import: chunk generation needs the Mesa world module
+        world = self.chunked_world
+        cells = ChunkedCells(world["width"], world["height"], world["chunk_size"], world["world_seed"],
+                             world["max_chunks"])
+        for x, y, terrain, obstacle in self.arrays["chunk_cells"].tolist():
+            cell = cells.cell(x, y)
+            cell.terrain_type = TerrainType(terrain)
+            cell.obstacle = None if obstacle == NO_OBSTACLE else ObstacleType(obstacle)
+            cells.mark_dirty(x, y)  # Without a spill directory a modified chunk is never evicted
+        return cells
+
+    def view(self, tick=None):
+        return ReplayView(self, self.first_tick if tick is None else tick)
+
+class ReplayView:
+    """Read-only stand-in for a model at one tick of a Replay.
+
+    Has the attributes SoulslikeUI draws from (grid size, cells and
+    schedule.agents); step() moves forward one recorded tick and stays on the
+    last one.
+    """
+    def __init__(self, replay, tick):
+        self.replay = replay
+        self.width, self.height = replay.width, replay.height
+        self.grid = ReplayGrid(self.width, self.height)
+        self.cells = replay.world_cells()
+        self.tick = tick
+        self.state = replay.state_at(tick)
+        self.schedule = ReplaySchedule(self.agents())
+
+    def agents(self):
+        return [ReplayAgent(int(row["id"]), AGENT_TYPES[row["kind"]], (int(row["x"]), int(row["y"])),
+                            float(row["health"]), float(row["max_health"]),
+                            [e for e in STATUS_EFFECTS if row["status"] >> e.value & 1])
+                for row in self.state]
+
+    def step(self):
+        if self.tick < self.replay.last_tick:
+            self.tick += 1
+            self.state = self.replay.advance(self.state, self.tick)
+            self.schedule = ReplaySchedule(self.agents())
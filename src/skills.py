@@ -1,5 +1,6 @@
 from enum import Enum
 from src.combat_system import CombatSystem, DamageType
+from src.progression_system import ProgressionManager
 
 class SkillType(Enum):
     OFFENSIVE = 1
@@ -7,19 +8,24 @@ class SkillType(Enum):
     UTILITY = 3
 
 class Skill:
+    __slots__ = ("name", "description", "skill_type", "stamina_cost", "cooldown", "skill_id")
+
     def __init__(self, name, description, skill_type, stamina_cost, cooldown):
         self.name = name
         self.description = description
         self.skill_type = skill_type
         self.stamina_cost = stamina_cost
         self.cooldown = cooldown
+        self.skill_id = None  # Index into agents' cooldown arrays, assigned by the catalog
 
     def can_use(self, agent):
-        return agent.stamina >= self.stamina_cost and agent.skill_cooldowns[self.name] == 0
+        return agent.stamina >= self.stamina_cost and agent.skill_ready(self)
 
     def use(self, agent, target=None):
         if self.can_use(agent):
             agent.stamina -= self.stamina_cost
+            if agent.model.recorder is not None:
+                agent.model.recorder.record_skill(agent, self, target)
             self.effect(agent, target)
         else:
             print(f"{agent.unique_id} cannot use {self.name} at this time.")
@@ -28,6 +34,8 @@ class Skill:
         pass  # To be implemented by subclasses
 
 class FireballSkill(Skill):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Fireball", "Launches a ball of fire at the target", SkillType.OFFENSIVE, 30, 3)
 
@@ -35,10 +43,13 @@ class FireballSkill(Skill):
         if target:
             damage = 20 + (agent.strength * 0.5)
             target.take_damage(damage)
+            ProgressionManager.credit_kill(agent, target)
             target.apply_status_effect("burning")
             print(f"{agent.unique_id} cast Fireball on {target.unique_id} for {damage} damage!")
 
 class HealingLightSkill(Skill):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Healing Light", "Restores some health to the user", SkillType.DEFENSIVE, 25, 5)
 
@@ -48,6 +59,8 @@ class HealingLightSkill(Skill):
         print(f"{agent.unique_id} used Healing Light and restored {heal_amount} health!")
 
 class QuickStepSkill(Skill):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Quick Step", "Performs a quick dodge in any direction", SkillType.UTILITY, 15, 1)
 
@@ -60,11 +73,29 @@ class QuickStepSkill(Skill):
 
 # Add more skills as needed
 
-skill_catalog = {
-    "fireball": FireballSkill(),
-    "healing_light": HealingLightSkill(),
-    "quick_step": QuickStepSkill(),
-}
+_skill_catalog = None
+
+def get_skill_catalog():
+    """Returns every skill by name, building the catalog on first use.
+
+    Skill ids index agents' cooldown arrays and follow the catalog order.
+    """
+    global _skill_catalog
+    if _skill_catalog is None:
+        _skill_catalog = {
+            "fireball": FireballSkill(),
+            "healing_light": HealingLightSkill(),
+            "quick_step": QuickStepSkill(),
+        }
+        for skill_id, skill in enumerate(_skill_catalog.values()):
+            skill.skill_id = skill_id
+    return _skill_catalog
 
 def get_skill(skill_name):
-    return skill_catalog.get(skill_name.lower())
\ No newline at end of file
+    return get_skill_catalog().get(skill_name.lower())
+
+def __getattr__(name):
+    # skill_catalog stays importable as a module attribute but is only built when first accessed
+    if name == "skill_catalog":
+        return get_skill_catalog()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
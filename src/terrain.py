@@ -0,0 +1,24 @@
+from enum import Enum
+
+class TerrainType(Enum):
+    DEFAULT = 0
+    GRASS = 1
+    STONE = 2
+    WATER = 3
+    LAVA = 4
+    POISON_SWAMP = 5
+
+class ObstacleType(Enum):
+    WALL = 0
+    TREE = 1
+    ROCK = 2
+    CHEST = 3
+    BONFIRE = 4
+
+# World generation parameters, shared by eager and chunked generation
+TERRAIN_WEIGHTS = [0.6, 0.2, 0.1, 0.05, 0.03, 0.02]
+OBSTACLE_WEIGHTS = [0.4, 0.3, 0.2, 0.1, 0]
+OBSTACLE_DENSITY = 0.1  # 10% of cells have obstacles
+BONFIRE_DENSITY = 0.01  # Up to 1% of cells have bonfires
+
+LAVA_DAMAGE = 10  # Damage per tick spent on lava
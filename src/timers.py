@@ -0,0 +1,35 @@
+import heapq
+import itertools
+
+class TimerQueue:
+    """Priority queue of callbacks keyed by the model tick they fire on.
+
+    Cooldown expiry, status-effect expiry and damage-over-time ticks are
+    scheduled here instead of being polled by every agent on every tick, so
+    an agent with nothing pending costs nothing per tick.
+    """
+    def __init__(self):
+        self.now = 0
+        self._events = []
+        self._counter = itertools.count()  # Tie-breaker keeps insertion order within a tick
+
+    def __len__(self):
+        return len(self._events)
+
+    def schedule(self, delay, callback, *args):
+        """Schedules callback(*args) to run `delay` ticks from now."""
+        return self.schedule_at(self.now + max(1, int(delay)), callback, *args)
+
+    def schedule_at(self, tick, callback, *args):
+        """Schedules callback(*args) to run at the given tick."""
+        heapq.heappush(self._events, (tick, next(self._counter), callback, args))
+        return tick
+
+    def advance(self):
+        """Moves the clock forward one tick and fires every event that is due."""
+        self.now += 1
+        events = self._events
+        while events and events[0][0] <= self.now:
+            _, _, callback, args = heapq.heappop(events)
+            callback(*args)
+        return self.now
@@ -1,6 +1,6 @@
 import pygame
-from src.environment import TerrainType, ObstacleType
-from src.agents import Player, Enemy, Neutral
+from src.terrain import TerrainType, ObstacleType
+from src.agent_types import AgentType
 
 # Define colors
 BLACK = (0, 0, 0)
@@ -12,7 +12,10 @@ YELLOW = (255, 255, 0)
 BROWN = (165, 42, 42)
 GRAY = (128, 128, 128)
 
+AGENT_COLORS = {AgentType.PLAYER: BLUE, AgentType.ENEMY: RED, AgentType.NEUTRAL: YELLOW}
+
 class SoulslikeUI:
+    """Draws and steps a SoulslikeModel, or a ReplayView of a recording."""
     def __init__(self, model, width=800, height=600):
         self.model = model
         self.width = width
@@ -90,14 +93,7 @@ class SoulslikeUI:
                 continue  # Skip agents with invalid positions
             x, y = agent.pos
             center = ((x + 0.5) * self.cell_size, (y + 0.5) * self.cell_size)
-            if isinstance(agent, Player):
-                color = BLUE
-            elif isinstance(agent, Enemy):
-                color = RED
-            elif isinstance(agent, Neutral):
-                color = YELLOW
-            else:
-                color = WHITE
+            color = AGENT_COLORS.get(agent.agent_type, WHITE)
             pygame.draw.circle(self.screen, color, center, self.cell_size // 3)
 
             # Draw health bar
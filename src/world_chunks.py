@@ -0,0 +1,147 @@
+from collections import OrderedDict
+import os
+import pickle
+import numpy as np
+from src.environment import (Cell, TerrainType, ObstacleType, TERRAIN_WEIGHTS, OBSTACLE_WEIGHTS,
+                             OBSTACLE_DENSITY, BONFIRE_DENSITY)
+
+TERRAIN_TYPES = list(TerrainType)
+OBSTACLE_TYPES = list(ObstacleType)
+
+class ChunkedCells:
+    """Drop-in replacement for World.cells that generates the map chunk by chunk.
+
+    cells[x][y] behaves like the eager nested list, but a chunk's terrain,
+    obstacles and bonfires are only generated the first time one of its cells
+    is read. Generation is seeded per chunk, so an evicted chunk regenerates
+    identically. At most max_chunks chunks are kept in memory; chunks changed
+    through World.set_terrain or World.add_obstacle are spilled to spill_dir on
+    eviction, or kept in memory when there is no spill directory.
+    """
+    def __init__(self, width, height, chunk_size, seed, max_chunks=None, spill_dir=None):
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.max_chunks = max_chunks
+        self.spill_dir = spill_dir
+        self.chunks = OrderedDict()  # (cx, cy) -> list of columns of Cells, least recently used first
+        self.dirty = set()
+        self.spilled = set()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self):
+        return self.width
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.width:
+            raise IndexError(x)
+        return ChunkColumn(self, x)
+
+    def __iter__(self):
+        for x in range(self.width):
+            yield ChunkColumn(self, x)
+
+    def cell(self, x, y):
+        """Returns the Cell at (x, y), loading its chunk if necessary."""
+        size = self.chunk_size
+        return self.get_chunk(x // size, y // size)[x % size][y % size]
+
+    def get_chunk(self, cx, cy):
+        """Returns a chunk, generating or reloading it on first access."""
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        if key in self.spilled:
+            chunk = self.load_chunk(cx, cy)
+        else:
+            chunk = self.generate_chunk(cx, cy)
+        self.chunks[key] = chunk
+        self.evict()
+        return chunk
+
+    def generate_chunk(self, cx, cy):
+        """Generates a chunk deterministically from the world seed and its coordinates."""
+        rng = np.random.default_rng([self.seed, cx, cy])
+        x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+        w = min(self.chunk_size, self.width - x0)
+        h = min(self.chunk_size, self.height - y0)
+        terrain = rng.choice(len(TERRAIN_TYPES), size=(w, h), p=TERRAIN_WEIGHTS)
+        chunk = [[Cell(x0 + i, y0 + j, TERRAIN_TYPES[terrain[i, j]]) for j in range(h)] for i in range(w)]
+
+        area = w * h
+        num_obstacles = int(area * OBSTACLE_DENSITY)
+        xs, ys = rng.integers(0, w, num_obstacles), rng.integers(0, h, num_obstacles)
+        kinds = rng.choice(len(OBSTACLE_TYPES), size=num_obstacles, p=OBSTACLE_WEIGHTS)
+        for i, j, kind in zip(xs, ys, kinds):
+            if not chunk[i][j].obstacle:
+                chunk[i][j].obstacle = OBSTACLE_TYPES[kind]
+
+        num_bonfires = int(area * BONFIRE_DENSITY)
+        for i, j in zip(rng.integers(0, w, num_bonfires), rng.integers(0, h, num_bonfires)):
+            if not chunk[i][j].obstacle:
+                chunk[i][j].obstacle = ObstacleType.BONFIRE
+        return chunk
+
+    def mark_dirty(self, x, y):
+        """Marks the chunk holding (x, y) as modified so eviction preserves it."""
+        self.dirty.add((x // self.chunk_size, y // self.chunk_size))
+
+    def evict(self):
+        """Evicts least recently used chunks until at most max_chunks are loaded."""
+        if not self.max_chunks:
+            return
+        for key in list(self.chunks):
+            if len(self.chunks) <= self.max_chunks:
+                break
+            if key in self.dirty:
+                if not self.spill_dir:
+                    continue  # Nowhere to keep the changes, so the chunk stays resident
+                self.spill_chunk(key)
+            del self.chunks[key]
+
+    def chunk_path(self, cx, cy):
+        return os.path.join(self.spill_dir, f"chunk_{cx}_{cy}.pkl")
+
+    def spill_chunk(self, key):
+        """Writes a modified chunk to the spill directory."""
+        chunk = self.chunks[key]
+        terrain = [[cell.terrain_type.value for cell in column] for column in chunk]
+        obstacles = [[cell.obstacle.value if cell.obstacle else None for cell in column] for column in chunk]
+        with open(self.chunk_path(*key), "wb") as f:
+            pickle.dump((terrain, obstacles), f)
+        self.dirty.discard(key)
+        self.spilled.add(key)
+
+    def load_chunk(self, cx, cy):
+        """Reloads a chunk previously spilled to disk."""
+        with open(self.chunk_path(cx, cy), "rb") as f:
+            terrain, obstacles = pickle.load(f)
+        x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+        chunk = []
+        for i, (terrain_column, obstacle_column) in enumerate(zip(terrain, obstacles)):
+            column = []
+            for j, (terrain_value, obstacle_value) in enumerate(zip(terrain_column, obstacle_column)):
+                cell = Cell(x0 + i, y0 + j, TerrainType(terrain_value))
+                if obstacle_value is not None:
+                    cell.obstacle = ObstacleType(obstacle_value)
+                column.append(cell)
+            chunk.append(column)
+        return chunk
+
+class ChunkColumn:
+    """A column of a chunked world, so that cells[x][y] keeps working."""
+    def __init__(self, cells, x):
+        self.cells = cells
+        self.x = x
+
+    def __len__(self):
+        return self.cells.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.cells.height:
+            raise IndexError(y)
+        return self.cells.cell(self.x, y)
@@ -0,0 +1,158 @@
+from collections import namedtuple
+import numpy as np
+from src.terrain import TerrainType, ObstacleType
+
+TERRAIN_TYPES = list(TerrainType)
+OBSTACLE_TYPES = list(ObstacleType)
+NO_OBSTACLE = -1
+
+# Picklable reference to layers in shared memory, small enough to send to every worker
+SharedLayersHandle = namedtuple("SharedLayersHandle", ["name", "width", "height"])
+
+class WorldLayers:
+    """Terrain, obstacle and walkability layers of a world as one int8 array.
+
+    The layers are stored as a (3, width, height) block so they can be placed
+    in shared memory or a .npy file and attached zero-copy by other processes:
+    a generated map is shared once with share() and workers call attach() with
+    the returned handle, or it is saved with save() and opened with load().
+    Attached and loaded layers are read-only.
+    """
+    def __init__(self, data, memory=None, owner=False):
+        self.data = data
+        self.memory = memory
+        self.owner = owner
+
+    @property
+    def width(self):
+        return self.data.shape[1]
+
+    @property
+    def height(self):
+        return self.data.shape[2]
+
+    @property
+    def terrain(self):
+        """TerrainType values per cell."""
+        return self.data[0]
+
+    @property
+    def obstacles(self):
+        """ObstacleType values per cell, NO_OBSTACLE where the cell is clear."""
+        return self.data[1]
+
+    @property
+    def walkable(self):
+        """Boolean mask of cells agents may enter."""
+        return self.data[2].view(np.bool_)
+
+    @classmethod
+    def from_world(cls, world):
+        """Builds layers from a World. A chunked world is fully generated in the process."""
+        data = np.zeros((3, world.width, world.height), dtype=np.int8)
+        for x in range(world.width):
+            column = world.cells[x]
+            for y in range(world.height):
+                cell = column[y]
+                data[0, x, y] = cell.terrain_type.value
+                data[1, x, y] = NO_OBSTACLE if cell.obstacle is None else cell.obstacle.value
+                data[2, x, y] = world.is_valid_move(x, y)
+        return cls(data)
+
+    def share(self):
+        """Moves the layers into a new shared memory block and returns its handle.
+
+        The process that shares the layers owns the block and must call
+        close() when the workers are done with it.
+        """
+        if self.memory is None:
+            from multiprocessing import shared_memory  # Lazy import: only needed when sharing across processes
+            memory = shared_memory.SharedMemory(create=True, size=self.data.nbytes)
+            shared = np.ndarray(self.data.shape, dtype=np.int8, buffer=memory.buf)
+            shared[:] = self.data
+            self.data, self.memory, self.owner = shared, memory, True
+        return SharedLayersHandle(self.memory.name, self.width, self.height)
+
+    @classmethod
+    def attach(cls, handle):
+        """Attaches read-only to layers shared by another process."""
+        from multiprocessing import shared_memory  # Lazy import: only needed when sharing across processes
+        memory = shared_memory.SharedMemory(name=handle.name)
+        data = np.ndarray((3, handle.width, handle.height), dtype=np.int8, buffer=memory.buf)
+        data.flags.writeable = False
+        return cls(data, memory)
+
+    def save(self, path):
+        """Writes the layers to a .npy file that load() can memory-map."""
+        np.save(path, np.asarray(self.data))
+
+    @classmethod
+    def load(cls, path):
+        """Memory-maps layers written by save(), read-only."""
+        return cls(np.load(path, mmap_mode="r"))
+
+    def close(self):
+        """Releases shared memory. The creating process keeps a private copy and unlinks the block."""
+        if self.memory is None:
+            return
+        self.data = np.array(self.data) if self.owner else None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+        self.memory, self.owner = None, False
+
+class LayerCells:
+    """Replacement for World.cells backed by WorldLayers, so cells[x][y] keeps working."""
+    def __init__(self, layers):
+        self.layers = layers
+
+    def __len__(self):
+        return self.layers.width
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.layers.width:
+            raise IndexError(x)
+        return LayerColumn(self.layers, x)
+
+    def __iter__(self):
+        for x in range(self.layers.width):
+            yield LayerColumn(self.layers, x)
+
+class LayerColumn:
+    """A column of layer-backed cells."""
+    def __init__(self, layers, x):
+        self.layers = layers
+        self.x = x
+
+    def __len__(self):
+        return self.layers.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.layers.height:
+            raise IndexError(y)
+        return LayerCell(self.layers, self.x, y)
+
+class LayerCell:
+    """View of one cell in WorldLayers with the attributes of environment.Cell."""
+    def __init__(self, layers, x, y):
+        self.layers = layers
+        self.x = x
+        self.y = y
+
+    @property
+    def terrain_type(self):
+        return TERRAIN_TYPES[self.layers.terrain[self.x, self.y]]
+
+    @terrain_type.setter
+    def terrain_type(self, terrain_type):
+        self.layers.terrain[self.x, self.y] = terrain_type.value
+
+    @property
+    def obstacle(self):
+        value = self.layers.obstacles[self.x, self.y]
+        return None if value == NO_OBSTACLE else OBSTACLE_TYPES[value]
+
+    @obstacle.setter
+    def obstacle(self, obstacle_type):
+        self.layers.obstacles[self.x, self.y] = NO_OBSTACLE if obstacle_type is None else obstacle_type.value
+        self.layers.walkable[self.x, self.y] = obstacle_type is None or obstacle_type == ObstacleType.BONFIRE
@@ -0,0 +1,14 @@
+import numpy as np
+import pytest
+from src.model import SoulslikeModel
+from src.world_layers import WorldLayers, NO_OBSTACLE
+
+@pytest.fixture
+def layer_model():
+    """Builds an empty SoulslikeModel on an open, fully walkable layer-backed map of the given size."""
+    def build(width, height):
+        layers = WorldLayers(np.zeros((3, width, height), dtype=np.int8))
+        layers.obstacles[:] = NO_OBSTACLE
+        layers.walkable[:] = True
+        return SoulslikeModel(width, height, 0, 0, 0, layers=layers)
+    return build
@@ -0,0 +1,25 @@
+import pytest
+from src.agent_types import AgentType
+from src.item_system import Consumable, Inventory, basic_equipment
+from src.skills import get_skill_catalog
+
+@pytest.mark.parametrize("agent_type", list(AgentType))
+def test_agents_reject_unknown_attributes(layer_model, agent_type):
+    model = layer_model(3, 3)
+    agent, = model.spawn_agents(agent_type, 1)
+    assert not hasattr(agent, "__dict__")
+    with pytest.raises(AttributeError):
+        agent.helth = 50  # A typo must not silently add an attribute
+    agent.health = 50  # Properties and slots still work
+    assert agent.health == 50
+    assert agent in model.agents  # Registered with the model like a mesa.Agent
+
+def test_items_and_skills_reject_unknown_attributes():
+    equipment = basic_equipment()
+    objects = [equipment, Inventory(capacity=2), Consumable("Estus", "heal", 1, 1),
+               *equipment.items, *get_skill_catalog().values()]
+    for obj in objects:
+        if obj is None:
+            continue
+        with pytest.raises(AttributeError):
+            obj.unknown = 1
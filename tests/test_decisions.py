@@ -0,0 +1,38 @@
+from src.agent_types import AgentType
+from src.ai_behavior import AIController
+from src.decision_engine import AIAction
+from src.skills import get_skill
+
+def test_hurt_neutral_heals_in_place_instead_of_chasing_the_player(layer_model):
+    model = layer_model(10, 10)
+    player, = model.spawn_agents(AgentType.PLAYER, 1)
+    neutral, = model.spawn_agents(AgentType.NEUTRAL, 1)
+    model.grid.move_agent(player, (1, 1))
+    model.grid.move_agent(neutral, (4, 1))
+    neutral.health = neutral.max_health * 0.2
+    health = neutral.health
+
+    model.perception.rebuild(model.schedule.agents)
+    model.decisions.decide([neutral])
+    assert neutral.ai_action[0] == AIAction.USE_SKILL
+    assert neutral.ai_target is None
+    AIController.update(neutral, model)
+
+    assert neutral.pos == (4, 1)
+    assert neutral.health > health
+
+def test_offensive_skill_is_not_cast_when_the_target_died_this_tick(layer_model):
+    model = layer_model(10, 10)
+    player, = model.spawn_agents(AgentType.PLAYER, 1)
+    enemy, = model.spawn_agents(AgentType.ENEMY, 1)
+    model.grid.move_agent(player, (1, 1))
+    model.grid.move_agent(enemy, (2, 1))
+    fireball = get_skill("fireball")
+    enemy.ai_action, enemy.ai_target = (AIAction.USE_SKILL, fireball.skill_id), player
+    player.die()  # Killed by another agent earlier in the tick
+    stamina = enemy.stamina
+    AIController.update(enemy, model)
+
+    assert enemy.stamina == stamina
+    assert enemy.skill_ready(fireball)
+    assert enemy.pos == (2, 1)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+import src.encounter
+from src.encounter import (Combatant, encounter_columns, quantile_interval, simulate_batch, simulate_encounter,
+                           WIN, TIMEOUT, ROUTED)
+
+def same_result(a, b):
+    return all(np.array_equal(getattr(a, name), getattr(b, name))
+               for name in ("outcome", "ticks", "attacks", "exhausted"))
+
+def test_players_only_use_healing_light():
+    enemies = [Combatant(2, skills=("fireball",)) for _ in range(2)]
+    full = simulate_encounter([Combatant(3, skills=("fireball", "healing_light", "quick_step"))], enemies, 2000)
+    healer = simulate_encounter([Combatant(3, skills=("healing_light",))], enemies, 2000)
+    assert same_result(full, healer)
+
+def test_enemies_never_attack_without_stamina():
+    # An enemy with no stamina has no affordable action and idles, so it can never win
+    columns = encounter_columns([Combatant(1)], [Combatant(1)])
+    columns["max_stamina"][1] = 0.0
+    columns["regen"][1] = 0.0
+    outcome, ticks, attacks, exhausted = simulate_batch(columns, 500, 50, np.random.SeedSequence(0))
+    assert set(np.unique(outcome).tolist()) <= {WIN, TIMEOUT}
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_result_does_not_depend_on_workers(workers):
+    team, enemies = [Combatant(2, skills=("healing_light",))], [Combatant(1, skills=("fireball",))]
+    reference = simulate_encounter(team, enemies, 3000, batch_size=1000)
+    assert same_result(simulate_encounter(team, enemies, 3000, batch_size=1000, workers=workers), reference)
+
+def test_routs_are_not_wins(monkeypatch):
+    team, enemies = [Combatant(5)], [Combatant(1), Combatant(1)]
+    monkeypatch.setattr(src.encounter, "FLEE_HEALTH", 1.01)  # Every enemy flees on its first action
+    routed = simulate_encounter(team, enemies, 500)
+    assert np.all(routed.outcome == ROUTED)
+    assert routed.time_to_kill() is None
+
+    monkeypatch.setattr(src.encounter, "FLEE_HEALTH", 0.0)  # Nobody flees, so every survived fight is a kill
+    fought = simulate_encounter(team, enemies, 500)
+    assert not np.any(fought.outcome == ROUTED)
+    wins = fought.ticks[fought.outcome == WIN]
+    assert fought.time_to_kill()[50][0] == np.percentile(wins, 50)
+
+def test_time_to_kill_intervals_bracket_the_percentiles(monkeypatch):
+    monkeypatch.setattr(src.encounter, "FLEE_HEALTH", 0.0)
+    team, enemies = [Combatant(3)], [Combatant(1)]
+    result = simulate_encounter(team, enemies, 4000)
+    for p, (value, (low, high)) in result.time_to_kill().items():
+        assert low <= value <= high
+    values = np.arange(1000)
+    assert quantile_interval(values, 0.5) == (469.0, 531.0)
+    assert quantile_interval(values[:10], 0.99) == (9.0, 9.0)  # Clamped to the samples
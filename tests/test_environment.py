@@ -0,0 +1,35 @@
+import pytest
+from src.agent_types import AgentType, StatusEffect
+from src.item_system import EquipmentSlot
+from src.terrain import TerrainType, ObstacleType, LAVA_DAMAGE
+
+def test_add_obstacle_claims_free_cell_in_layer_world(layer_model):
+    model = layer_model(2, 1)
+    model.add_obstacle(0, 0, ObstacleType.WALL)
+    with pytest.raises(ValueError):
+        model.spawn_agents(AgentType.ENEMY, 2)
+    assert [agent.pos for agent in model.spawn_agents(AgentType.ENEMY, 1)] == [(1, 0)]
+
+def test_clearing_obstacle_releases_free_cell_in_layer_world(layer_model):
+    model = layer_model(2, 1)
+    model.add_obstacle(0, 0, ObstacleType.WALL)
+    model.add_obstacle(0, 0, None)
+    assert sorted(agent.pos for agent in model.spawn_agents(AgentType.ENEMY, 2)) == [(0, 0), (1, 0)]
+
+def test_lava_damage_matches_take_damage(layer_model):
+    model = layer_model(3, 2)
+    model.layers.terrain[:2] = TerrainType.LAVA.value
+    agents = model.spawn_agents(AgentType.ENEMY, 5)
+    for agent, pos in zip(agents, [(0, 0), (0, 1), (1, 0), (1, 1), (2, 0)]):
+        model.grid.move_agent(agent, pos)
+    armored, bare, invulnerable, dying, off_lava = agents
+    for slot in EquipmentSlot:
+        bare.equipment.unequip(slot)
+    invulnerable.status_effects = [StatusEffect.INVULNERABLE]
+    dying.health = 2
+    expected = [armored.health - max(1, LAVA_DAMAGE - armored.equipment.get_total_defense()),
+                bare.health - LAVA_DAMAGE, invulnerable.health, None, off_lava.health]
+
+    model.apply_environmental_effects(model.schedule.agents)
+    assert [agent.health if agent.pos is not None else None for agent in agents] == expected
+    assert dying not in model.schedule.agents
@@ -0,0 +1,10 @@
+import os
+import subprocess
+import sys
+import pytest
+
+@pytest.mark.parametrize("module", ["src.model", "src.partition", "src.encounter", "src.replay"])
+def test_core_modules_do_not_import_pygame(module):
+    # A fresh interpreter, since this one may already have pygame loaded
+    code = f"import sys, {module}; assert 'pygame' not in sys.modules, 'pygame was imported'"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
@@ -0,0 +1,114 @@
+import random
+import numpy as np
+import pytest
+from src.agent_types import AgentType
+from src.item_system import Weapon, EquipmentSlot
+from src.partition import AGENT_DTYPE, PartitionedSimulation
+from src.terrain import TerrainType, ObstacleType
+from src.world_layers import WorldLayers, NO_OBSTACLE
+
+SIZE = 48
+AGENTS = 400
+TICKS = 25
+
+def build_state(seed=0):
+    """A random map with lava and rocks and a crowded mixed population."""
+    rng = np.random.default_rng(seed)
+    layers = WorldLayers(np.zeros((3, SIZE, SIZE), dtype=np.int8))
+    layers.terrain[:] = np.where(rng.random((SIZE, SIZE)) < 0.05, TerrainType.LAVA.value, TerrainType.GRASS.value)
+    layers.walkable[:] = rng.random((SIZE, SIZE)) >= 0.1
+    layers.obstacles[:] = np.where(layers.walkable, NO_OBSTACLE, ObstacleType.ROCK.value)
+    state = np.zeros(AGENTS, dtype=AGENT_DTYPE)
+    cells = rng.choice(np.flatnonzero(layers.walkable), size=AGENTS, replace=False)
+    state["id"] = np.arange(AGENTS)
+    state["kind"] = rng.choice([AgentType.PLAYER.value, AgentType.ENEMY.value, AgentType.NEUTRAL.value],
+                               size=AGENTS, p=[0.3, 0.5, 0.2])
+    state["alive"] = True
+    state["x"], state["y"] = np.divmod(cells, SIZE)
+    state["health"] = 100.0
+    state["stamina"] = state["max_stamina"] = 100.0
+    state["strength"] = state["dexterity"] = state["endurance"] = 10.0
+    state["weapon_damage"] = 10.0
+    state["attack_cost"] = 10.0
+    state["defense"] = rng.integers(0, 4, size=AGENTS)
+    state["detection_range"] = rng.integers(2, 6, size=AGENTS)
+    return state, layers
+
+@pytest.fixture(scope="module")
+def world():
+    return build_state()
+
+@pytest.fixture(scope="module")
+def reference(world):
+    state, layers = world
+    sim = PartitionedSimulation(state, layers, (1, 1), seed=7)
+    sim.run(TICKS, workers=0)
+    return sim.state
+
+def test_reference_run_has_combat(world, reference):
+    state, _ = world
+    assert not np.array_equal(reference["health"], state["health"])
+    assert (~reference["alive"]).any()
+
+@pytest.mark.parametrize("regions", [(1, 2), (2, 2), (3, 2)])
+@pytest.mark.parametrize("workers", [0, 1, 2, 3])
+def test_partitioned_run_matches_serial(world, reference, regions, workers):
+    state, layers = world
+    sim = PartitionedSimulation(state, layers, regions, seed=7)
+    sim.run(TICKS, workers=workers)
+    assert np.array_equal(sim.state, reference)
+
+def test_split_run_matches_single_run(world, reference):
+    state, layers = world
+    sim = PartitionedSimulation(state, layers, (2, 2), seed=7)
+    sim.run(10, workers=2)
+    sim.run(TICKS - 10, workers=2)
+    assert np.array_equal(sim.state, reference)
+
+def standoff_model(layer_model, seed):
+    """A model on which every rule the two engines share leaves no choice.
+
+    Players can afford no attack and each has an adjacent enemy, so they
+    stand still. Enemies regenerate exactly one light attack's worth of
+    stamina per tick, so heavy attacks and fireball are never affordable.
+    Nobody dodges or lands critical hits, one enemy chases along a straight
+    line, two agents stand on lava and nobody drops to a flee or heal threshold.
+    """
+    random.seed(seed)  # Mesa seeds each model from the global random module
+    model = layer_model(12, 12)
+    model.layers.terrain[:] = TerrainType.GRASS.value
+    model.layers.terrain[2, 8] = model.layers.terrain[3, 2] = TerrainType.LAVA.value
+    players = model.spawn_agents(AgentType.PLAYER, 3)
+    enemies = model.spawn_agents(AgentType.ENEMY, 4)
+    for agent, pos in zip(players + enemies, [(2, 2), (2, 8), (9, 9), (3, 2), (2, 7), (9, 10), (6, 9)]):
+        model.grid.move_agent(agent, pos)
+        agent.max_health = agent.health = 1000.0
+    for player in players:
+        player.equipment.equip(Weapon("Boulder", 10, 100, 50, 0), EquipmentSlot.MAIN_HAND)
+        player.dexterity = -60  # No chance to dodge
+    for enemy in enemies:
+        enemy.equipment.equip(Weapon("Cleaver", 40, 0.4, 1, 0), EquipmentSlot.MAIN_HAND)  # Light attacks cost 6
+        enemy.endurance = 10  # Regenerates 6 stamina per tick
+        enemy.max_stamina = enemy.stamina = 6.0
+        enemy.dexterity = -25  # No chance of a critical hit
+    return model
+
+def test_partitioned_run_matches_model_on_shared_rules(layer_model):
+    model = standoff_model(layer_model, seed=11)
+    for _ in range(10):
+        model.step()
+
+    partitioned = standoff_model(layer_model, seed=11)
+    sim = PartitionedSimulation.from_model(partitioned, (2, 2), seed=11)
+    sim.run(10, workers=0)
+    sim.to_model(partitioned)
+
+    expected = {agent.unique_id: agent for agent in model.schedule.agents}
+    actual = {agent.unique_id: agent for agent in partitioned.schedule.agents}
+    assert expected.keys() == actual.keys()
+    assert expected[7].pos == actual[7].pos == (8, 9)  # The chaser caught up and attacked
+    assert expected[1].health < 1000 - 10 * 20  # Hits get through both defense reductions
+    for unique_id, agent in expected.items():
+        assert actual[unique_id].pos == agent.pos
+        assert actual[unique_id].stamina == agent.stamina
+        assert actual[unique_id].health == pytest.approx(agent.health, abs=1e-2)
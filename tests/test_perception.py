@@ -0,0 +1,32 @@
+import random
+import pytest
+from src.agent_types import AgentType
+from src.model import SoulslikeModel
+
+def brute_force_nearest(agent, agents):
+    """Scans every player: the nearest within detection range, the earliest scheduled on ties."""
+    best = None
+    for order, other in enumerate(agents):
+        if other.agent_type != AgentType.PLAYER or other.pos is None:
+            continue
+        distance = abs(agent.pos[0] - other.pos[0]) + abs(agent.pos[1] - other.pos[1])
+        if distance <= agent.detection_range and (best is None or (distance, order) < best[:2]):
+            best = (distance, order, other)
+    return None if best is None else best[2]
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_perception_matches_brute_force(seed):
+    random.seed(seed)  # Mesa seeds each model from the global random module
+    model = SoulslikeModel(30, 30, 15, 40, 10)
+    for agent in model.schedule.agents:
+        agent.detection_range = random.randint(1, 12)  # Spans several hash-grid buckets
+    for _ in range(5):
+        agents = model.schedule.agents
+        model.perception.rebuild(agents)
+        for agent in agents:
+            neighbours = model.grid.get_neighbors(agent.pos, moore=True, include_center=False)
+            assert (sorted(a.unique_id for a in model.perception.adjacent_agents(agent))
+                    == sorted(a.unique_id for a in neighbours))
+            if agent.agent_type != AgentType.PLAYER:
+                assert model.perception.nearest_player(agent) is brute_force_nearest(agent, agents)
+        model.step()
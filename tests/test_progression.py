@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from src.agent_types import AgentType
+from src.progression_system import (ProgressionManager, MAX_LEVEL, XP_PER_LEVEL, KILL_EXPERIENCE, derived_stats,
+                                    get_level_table)
+
+def loop_level_up(level, experience, amount):
+    """The level-up rule before the level table: one level per pass while the experience covers it."""
+    experience += amount
+    while level < MAX_LEVEL and experience >= level * XP_PER_LEVEL:
+        level += 1
+        experience -= (level - 1) * XP_PER_LEVEL
+    return level, experience
+
+def test_level_table_is_built_on_first_use():
+    code = ("import src.progression_system as p; assert p._level_table is None; "
+            "assert p.LEVEL_TABLE is p.get_level_table()")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+
+def test_award_crossing_several_levels(layer_model):
+    model = layer_model(3, 3)
+    agent, = model.spawn_agents(AgentType.NEUTRAL, 1)
+    levelled = ProgressionManager.award_experience([agent, agent], [100 + 200 + 300, 50])
+    assert levelled == [agent]
+    assert (agent.level, agent.experience) == (4, 50)
+    assert (agent.strength, agent.dexterity, agent.vitality, agent.endurance) == (13, 13, 13, 13)
+    assert (agent.max_health, agent.max_stamina, agent.max_poise) == derived_stats(13, 13, 13)
+
+def test_levels_are_clamped_at_max_level(layer_model):
+    model = layer_model(3, 3)
+    agent, = model.spawn_agents(AgentType.NEUTRAL, 1)
+    ProgressionManager.gain_experience(agent, 10 ** 9)
+    table = get_level_table()
+    assert agent.level == MAX_LEVEL
+    assert agent.experience == 10 ** 9 - table["xp_to_reach"][MAX_LEVEL]
+    assert agent.strength == table["strength"][MAX_LEVEL]
+    assert agent.max_health == table["max_health"][MAX_LEVEL]
+    assert not ProgressionManager.check_level_up(agent)
+    with pytest.raises(ValueError):
+        ProgressionManager.level_up(agent)
+
+def test_batched_awards_match_the_loop(layer_model):
+    model = layer_model(20, 20)
+    agents = model.spawn_agents(AgentType.ENEMY, 200)
+    rng = np.random.default_rng(0)
+    ProgressionManager.set_levels(agents, rng.integers(1, MAX_LEVEL + 1, size=len(agents)))
+    for agent in agents:
+        agent.experience = int(rng.integers(0, agent.level * XP_PER_LEVEL))
+    awarded = rng.choice(agents, size=300).tolist()  # Some agents get several awards
+    amounts = rng.integers(0, 30000, size=len(awarded)).tolist()
+
+    expected = {agent: (agent.level, agent.experience) for agent in agents}
+    for agent, amount in zip(awarded, amounts):
+        expected[agent] = loop_level_up(*expected[agent], amount)
+    ProgressionManager.award_experience(awarded, amounts)
+
+    for agent, (level, experience) in expected.items():
+        assert (agent.level, agent.experience) == (level, experience)
+        assert agent.strength == agent.endurance == 10 + level - 1  # One point per level, as the old level_up
+        assert (agent.max_health, agent.max_stamina, agent.max_poise) == derived_stats(
+            agent.strength, agent.vitality, agent.endurance)
+
+def test_credit_kill_awards_experience_at_the_end_of_the_tick(layer_model):
+    model = layer_model(5, 5)
+    player, = model.spawn_agents(AgentType.PLAYER, 1)
+    enemy, survivor = model.spawn_agents(AgentType.ENEMY, 2)
+    ProgressionManager.set_levels([enemy], [3])
+
+    ProgressionManager.credit_kill(player, survivor)  # Still alive: nothing to credit
+    enemy.die()
+    ProgressionManager.credit_kill(player, enemy)
+    ProgressionManager.credit_kill(survivor, enemy)
+    assert model.experience_awards == [(player, KILL_EXPERIENCE * 3), (survivor, KILL_EXPERIENCE * 3)]
+    assert player.experience == 0
+
+    player.die()  # Killers that die before the end of the tick get nothing
+    model.award_experience()
+    assert (survivor.level, survivor.experience) == (2, KILL_EXPERIENCE * 3 - XP_PER_LEVEL)
+    assert (player.level, player.experience) == (1, 0)
+    assert model.experience_awards == []
@@ -0,0 +1,41 @@
+import numpy as np
+from src.model import SoulslikeModel
+from src.replay import ReplayRecorder, Replay
+from src.terrain import ObstacleType
+
+def run_recorded(recorder, ticks):
+    model = recorder.model
+    snapshots = {model.timers.now: recorder.snapshot()}
+    for _ in range(ticks):
+        model.step()
+        snapshots[model.timers.now] = recorder.snapshot()
+    return recorder, snapshots
+
+def test_replay_matches_live_states():
+    model = SoulslikeModel(20, 20, 3, 10, 3)
+    recorder, snapshots = run_recorded(ReplayRecorder(model, keyframe_interval=4), 12)
+    replay = recorder.replay()
+    for tick, snapshot in snapshots.items():
+        assert np.array_equal(replay.state_at(tick), snapshot)
+
+def test_chunked_world_is_recorded_by_seed(tmp_path):
+    model = SoulslikeModel(40000, 40000, 2, 4, 1, chunk_size=32)
+    model.add_obstacle(39999, 39999, ObstacleType.WALL)
+    chunks = len(model.cells.chunks)
+    recorder = ReplayRecorder(model, keyframe_interval=4)
+    assert len(model.cells.chunks) == chunks
+    recorder, snapshots = run_recorded(recorder, 5)
+    path = tmp_path / "replay.npz"
+    recorder.save(path)
+    replay = Replay.load(path)
+    assert "layers" not in replay.arrays
+
+    for tick, snapshot in snapshots.items():
+        assert np.array_equal(replay.state_at(tick), snapshot)
+    view = replay.view(replay.last_tick)
+    for agent in view.schedule.agents:
+        x, y = agent.pos
+        assert x >= 0 and y >= 0
+        assert view.cells[x][y].terrain_type == model.cells[x][y].terrain_type
+        assert view.cells[x][y].obstacle == model.cells[x][y].obstacle
+    assert view.cells[39999][39999].obstacle == ObstacleType.WALL
@@ -0,0 +1,95 @@
+import pytest
+from src.agent_types import AgentType, StatusEffect, STATUS_EFFECT_DURATIONS
+from src.skills import get_skill_catalog
+from src.timers import TimerQueue
+
+def test_events_fire_in_tick_then_insertion_order():
+    timers = TimerQueue()
+    fired = []
+    timers.schedule(2, fired.append, "b")
+    timers.schedule(1, fired.append, "a")
+    timers.schedule(2, fired.append, "c")
+    timers.schedule(0, fired.append, "next tick")  # Delays below one tick still wait for the next tick
+    timers.advance()
+    assert fired == ["a", "next tick"]
+    timers.advance()
+    assert fired == ["a", "next tick", "b", "c"]
+    assert len(timers) == 0
+
+def countdown_ready_tick(used_on, cooldown):
+    """The tick a skill became usable again under the old per-tick countdown.
+
+    The countdown was set when the skill was used during an agent's step and
+    decremented at the start of each of that agent's later steps.
+    """
+    remaining, tick = cooldown, used_on
+    while remaining:
+        tick += 1
+        remaining -= 1
+    return tick
+
+@pytest.mark.parametrize("name", list(get_skill_catalog()))
+def test_cooldown_ends_on_the_same_tick_as_the_old_countdown(layer_model, name):
+    model = layer_model(3, 3)
+    player, = model.spawn_agents(AgentType.PLAYER, 1)
+    skill = get_skill_catalog()[name]
+    for _ in range(3):
+        model.timers.advance()
+    used_on = model.timers.now
+    player.use_skill(skill.name)
+    assert not player.skill_ready(skill)
+
+    ready_on = countdown_ready_tick(used_on, skill.cooldown)
+    while model.timers.now < ready_on - 1:
+        model.timers.advance()
+        assert not player.skill_ready(skill)
+    model.timers.advance()
+    assert player.skill_ready(skill)
+
+def test_reapplying_a_status_effect_pushes_back_its_expiry(layer_model):
+    model = layer_model(3, 3)
+    agent, = model.spawn_agents(AgentType.NEUTRAL, 1)
+    duration = STATUS_EFFECT_DURATIONS[StatusEffect.WET]
+    agent.apply_status_effect("wet")
+    model.timers.advance()
+    agent.apply_status_effect("wet")
+
+    # The first application's timer fires on this tick and must leave the effect alone
+    while model.timers.now < duration:
+        model.timers.advance()
+    assert agent.has_status_effect("wet")
+    while model.timers.now < 1 + duration:
+        model.timers.advance()
+    assert not agent.has_status_effect("wet")
+    assert len(model.timers) == 0
+
+def test_damage_over_time_stops_when_the_agent_dies(layer_model):
+    model = layer_model(3, 3)
+    agent, = model.spawn_agents(AgentType.NEUTRAL, 1)
+    agent.apply_status_effect("poison")
+    health = agent.health
+    model.timers.advance()
+    assert agent.health < health
+
+    agent.health = 1
+    model.timers.advance()
+    assert agent.pos is None
+    health = agent.health
+    for _ in range(STATUS_EFFECT_DURATIONS[StatusEffect.POISON] + 2):
+        model.timers.advance()
+    assert agent.health == health
+    assert len(model.timers) == 0  # The damage tick was not rescheduled
+
+def test_lazy_regeneration_is_capped_at_the_maximum(layer_model):
+    model = layer_model(3, 3)
+    agent, = model.spawn_agents(AgentType.NEUTRAL, 1)
+    agent.stamina = agent.max_stamina - 1
+    agent.health_regen = 2.0
+    agent.health = agent.max_health - 3
+    model.timers.advance()
+    assert agent.stamina == agent.max_stamina
+    assert agent.health == agent.max_health - 1
+    for _ in range(50):
+        model.timers.advance()
+    assert agent.stamina == agent.max_stamina
+    assert agent.health == agent.max_health
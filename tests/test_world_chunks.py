@@ -0,0 +1,116 @@
+from collections import deque
+import os
+import random
+import pytest
+from mesa.space import MultiGrid
+from src.environment import World, SparseGrid
+from src.terrain import TerrainType, ObstacleType
+
+def map_of(world):
+    return [[(cell.terrain_type, cell.obstacle) for cell in column] for column in world.cells]
+
+def shortest_path_length(world, start, end):
+    """Breadth-first search over the whole map: the number of cells on a shortest path."""
+    seen = {start: 1}
+    queue = deque([start])
+    while queue:
+        x, y = current = queue.popleft()
+        if current == end:
+            return seen[current]
+        for neighbor in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if neighbor not in seen and (neighbor == end or world.is_valid_move(*neighbor)):
+                seen[neighbor] = seen[current] + 1
+                queue.append(neighbor)
+    return None
+
+def check_path(world, path, start, end):
+    assert path[0] == start and path[-1] == end
+    for a, b in zip(path, path[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+    assert all(world.is_valid_move(*pos) for pos in path[1:-1])
+
+@pytest.mark.parametrize("torus", [True, False])
+def test_sparse_grid_matches_multigrid(torus):
+    sparse, dense = SparseGrid(7, 5, torus), MultiGrid(7, 5, torus)
+    for pos in [(0, 0), (6, 4), (3, 2), (0, 3), (6, 1)]:
+        for moore in (True, False):
+            for include_center in (True, False):
+                for radius in (1, 2, 3):
+                    assert (sparse.get_neighborhood(pos, moore, include_center, radius)
+                            == dense.get_neighborhood(pos, moore, include_center, radius))
+
+def test_sparse_grid_tracks_occupants():
+    grid = SparseGrid(10, 10, True)
+    agent = type("Agent", (), {"pos": None})()
+    grid.place_agent(agent, (2, 3))
+    assert not grid.is_cell_empty((2, 3))
+    assert grid.get_cell_list_contents([(2, 3), (4, 4)]) == [agent]
+    grid.move_agent(agent, (10, 3))  # Wraps around the torus
+    assert agent.pos == (0, 3)
+    assert grid.is_cell_empty((2, 3)) and grid.occupied == {(0, 3): [agent]}
+    grid.remove_agent(agent)
+    assert agent.pos is None and not grid.occupied
+
+def test_chunked_world_startup_does_not_grow_with_area():
+    world = World(100000, 100000, chunk_size=32)
+    assert len(world.cells.chunks) == 0
+    assert not world.grid.occupied
+
+def test_evicted_chunks_regenerate_and_spilled_chunks_reload(tmp_path):
+    spill_dir = str(tmp_path / "spill")
+    random.seed(3)  # Mesa seeds each model from the global random module
+    reference = World(64, 64, chunk_size=16)
+    random.seed(3)
+    world = World(64, 64, chunk_size=16, max_chunks=2, spill_dir=spill_dir)
+    assert world.world_seed == reference.world_seed
+
+    world.set_terrain(1, 1, TerrainType.LAVA)
+    world.add_obstacle(2, 2, ObstacleType.WALL)
+    reference.set_terrain(1, 1, TerrainType.LAVA)
+    reference.add_obstacle(2, 2, ObstacleType.WALL)
+
+    assert map_of(world) == map_of(reference)  # Reading every cell evicts all but two chunks
+    assert len(world.cells.chunks) <= 2
+    assert (0, 0) in world.cells.spilled
+    assert os.path.exists(os.path.join(spill_dir, "chunk_0_0.pkl"))
+    assert world.cells[1][1].terrain_type == TerrainType.LAVA
+    assert world.cells[2][2].obstacle == ObstacleType.WALL
+    assert not world.is_valid_move(2, 2)
+
+def test_modified_chunks_stay_resident_without_spill_dir():
+    world = World(64, 64, chunk_size=16, max_chunks=1)
+    world.add_obstacle(0, 0, ObstacleType.WALL)
+    map_of(world)
+    assert (0, 0) in world.cells.chunks
+    assert world.cells[0][0].obstacle == ObstacleType.WALL
+
+def test_get_path_goes_around_a_wall(layer_model):
+    model = layer_model(7, 7)
+    for y in range(6):
+        model.add_obstacle(3, y, ObstacleType.WALL)
+    path = model.get_path((0, 0), (6, 0))
+    check_path(model, path, (0, 0), (6, 0))
+    assert (3, 6) in path
+    assert len(path) == 19
+
+def test_get_path_may_end_on_an_obstacle(layer_model):
+    model = layer_model(5, 1)
+    model.add_obstacle(4, 0, ObstacleType.ROCK)
+    assert model.get_path((0, 0), (4, 0)) == [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)]
+    model.add_obstacle(2, 0, ObstacleType.ROCK)
+    assert model.get_path((0, 0), (4, 0)) is None
+
+@pytest.mark.parametrize("max_chunks", [None, 2])
+def test_get_path_crosses_chunk_edges(tmp_path, max_chunks):
+    world = World(64, 64, chunk_size=8, max_chunks=max_chunks, spill_dir=str(tmp_path))
+    free = [(x, y) for x in range(64) for y in range(64) if world.is_valid_move(x, y)]
+    pairs = [(free[0], free[-1]), (free[len(free) // 3], free[2 * len(free) // 3]), (free[5], free[-40])]
+    for start, end in pairs:
+        expected = shortest_path_length(world, start, end)
+        path = world.get_path(start, end, max_nodes=64 * 64)
+        if expected is None:
+            assert path is None
+            continue
+        check_path(world, path, start, end)
+        assert len(path) == expected
+        assert len({(x // 8, y // 8) for x, y in path}) > 1
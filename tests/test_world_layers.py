@@ -0,0 +1,49 @@
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+from src.environment import World
+from src.terrain import TerrainType
+from src.world_layers import WorldLayers, LayerCells
+
+def cells_of(cells, width, height):
+    return [[(cells[x][y].terrain_type, cells[x][y].obstacle) for y in range(height)] for x in range(width)]
+
+@pytest.fixture
+def world():
+    return World(12, 9)
+
+def test_from_world_matches_cells(world):
+    layers = WorldLayers.from_world(world)
+    assert cells_of(LayerCells(layers), 12, 9) == cells_of(world.cells, 12, 9)
+    assert layers.walkable.tolist() == [[world.is_valid_move(x, y) for y in range(9)] for x in range(12)]
+
+def test_shared_layers_round_trip_and_close_releases_memory(world):
+    layers = WorldLayers.from_world(world)
+    expected = layers.data.copy()
+    handle = layers.share()
+    assert layers.share() == handle  # Sharing twice reuses the block
+
+    attached = WorldLayers.attach(handle)
+    assert np.array_equal(attached.data, expected)
+    assert not attached.data.flags.writeable
+    layers.terrain[0, 0] = TerrainType.LAVA.value
+    assert attached.terrain[0, 0] == TerrainType.LAVA.value  # Zero-copy: the attached view sees the owner's writes
+
+    attached.close()
+    assert attached.data is None and attached.memory is None
+    layers.close()
+    assert layers.memory is None and layers.terrain[0, 0] == TerrainType.LAVA.value  # The owner keeps a private copy
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=handle.name)
+
+def test_saved_layers_load_read_only(world, tmp_path):
+    layers = WorldLayers.from_world(world)
+    path = tmp_path / "layers.npy"
+    layers.save(path)
+    loaded = WorldLayers.load(path)
+    assert np.array_equal(loaded.data, layers.data)
+    assert cells_of(LayerCells(loaded), 12, 9) == cells_of(world.cells, 12, 9)
+    with pytest.raises(ValueError):
+        loaded.terrain[0, 0] = 0
+    loaded.close()  # Nothing shared, so closing leaves the map readable
+    assert np.array_equal(loaded.data, layers.data)